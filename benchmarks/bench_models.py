@@ -0,0 +1,150 @@
+"""Benchmark backend model: waktu muat, latensi per halaman, dan kesesuaian kotak
+(IoU) setiap backend terhadap jalur awal PyTorch fp32.
+
+Waktu muat diukur dari salinan lokal yang sudah siap: setiap backend dimuat sekali
+tanpa diukur agar unduhan, penyimpanan salinan, dan ekspor ONNX tidak ikut terhitung.
+
+Model struktur dijalankan pada potongan tabel hasil deteksi fp32 untuk semua backend,
+sehingga kesesuaian struktur tidak tercampur dengan perbedaan deteksi.
+
+Contoh:
+    python benchmarks/bench_models.py --pdf laporan.pdf --pages 5
+    python benchmarks/bench_models.py --backends torch,int8,onnx --device cpu
+    python benchmarks/bench_models.py --image halaman.png --repeat 3
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_ocr import make_synthetic_table  # noqa: E402
+from ekstraktor.models import MODEL_SNAPSHOT_DIR, TableModels  # noqa: E402
+
+IOU_MATCH = 0.5
+
+
+def synthetic_page(seed):
+    """Halaman A4 200 DPI dengan satu tabel sintetis di tengah."""
+    table, _, _ = make_synthetic_table(12, 5, seed=seed)
+    page = Image.new("RGB", (1654, 2339), "white")
+    page.paste(table, ((page.width - table.width) // 2, 400))
+    return page
+
+
+def load_pages(args):
+    if args.pdf:
+        from ekstraktor.pages import PdfPageSource
+
+        source = PdfPageSource(args.pdf, dpi=args.dpi)
+        pages = list(range(1, min(args.pages, source.page_count()) + 1))
+        return [image for _, image in source.iter_pages(pages)]
+    if args.image:
+        return [Image.open(path).convert("RGB") for path in args.image]
+    return [synthetic_page(seed) for seed in range(args.pages)]
+
+
+def iou(a, b):
+    ix = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def box_agreement(reference, candidate):
+    """(rata-rata IoU terbaik per kotak referensi, porsi kotak dengan IoU >= IOU_MATCH).
+
+    Kotak kandidat yang tidak punya pasangan di referensi ikut menurunkan skor lewat
+    pencocokan dua arah.
+    """
+    scores = []
+    for boxes_a, boxes_b in ((reference, candidate), (candidate, reference)):
+        for box in boxes_a:
+            scores.append(max((iou(box, other) for other in boxes_b), default=0.0))
+    if not scores:
+        return 1.0, 1.0
+    return sum(scores) / len(scores), sum(score >= IOU_MATCH for score in scores) / len(scores)
+
+
+def flatten_structure(structures):
+    return [[*rows, *cols] for rows, cols in structures]
+
+
+def run_backend(backend, pages, crops, args):
+    device = "cpu" if args.device == "cpu" else None
+
+    def make_models():
+        return TableModels(batch_size=args.batch_size, detection_backend=backend, structure_backend=backend, device=device)
+
+    # Pemuatan pertama menyiapkan salinan lokal (dan ekspor ONNX); tidak diukur
+    make_models().load()
+    gc.collect()
+    models = make_models()
+    start = time.perf_counter()
+    models.load()
+    load_seconds = time.perf_counter() - start
+
+    models.detect_tables(pages[:1])  # pemanasan
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        detections = models.detect_tables(pages)
+    detect_seconds = (time.perf_counter() - start) / args.repeat
+
+    if crops is None:
+        crops = [page.crop(box) for page, boxes in zip(pages, detections) for box in boxes]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        structures = models.recognize_structure(crops)
+    structure_seconds = (time.perf_counter() - start) / args.repeat
+    timing = {
+        "load": load_seconds,
+        "detect_per_page": detect_seconds / len(pages),
+        "structure_per_page": structure_seconds / len(pages),
+        "describe": models.describe(),
+    }
+    return timing, detections, structures, crops
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", help="PDF nyata; diambil --pages halaman pertama")
+    parser.add_argument("--image", nargs="+", help="Gambar halaman nyata")
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--dpi", type=int, default=200)
+    parser.add_argument("--backends", default="torch,int8,onnx", help="Daftar backend dipisah koma; 'torch' selalu menjadi acuan")
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--device", choices=["auto", "cpu"], default="auto", help="'cpu' memaksa acuan fp32 berjalan di CPU")
+    args = parser.parse_args()
+
+    pages = load_pages(args)
+    backends = [name.strip() for name in args.backends.split(",") if name.strip() and name.strip() != "torch"]
+    print(f"{len(pages)} halaman, batch {args.batch_size}, ulangan {args.repeat}x, salinan model di {MODEL_SNAPSHOT_DIR}/")
+
+    reference, ref_detections, ref_structures, crops = run_backend("torch", pages, None, args)
+    print(f"  {'backend':<6} {'muat':>7} {'deteksi/hlm':>12} {'struktur/hlm':>13} {'IoU deteksi':>12} {'IoU struktur':>13}")
+
+    def report(name, timing, detections, structures):
+        # Dipasangkan per halaman agar kotak satu halaman tidak cocok dengan kotak halaman lain
+        det_pairs = [box_agreement(a, b) for a, b in zip(ref_detections, detections)]
+        det_iou = sum(p[0] for p in det_pairs) / len(det_pairs) if det_pairs else 1.0
+        det_match = sum(p[1] for p in det_pairs) / len(det_pairs) if det_pairs else 1.0
+        struct_pairs = [box_agreement(a, b) for a, b in zip(flatten_structure(ref_structures), flatten_structure(structures))]
+        struct_iou = sum(p[0] for p in struct_pairs) / len(struct_pairs) if struct_pairs else 1.0
+        struct_match = sum(p[1] for p in struct_pairs) / len(struct_pairs) if struct_pairs else 1.0
+        print(f"  {name:<6} {timing['load']:6.2f}s {timing['detect_per_page'] * 1000:10.0f}ms "
+              f"{timing['structure_per_page'] * 1000:11.0f}ms {det_iou:7.3f} ({det_match:.0%}) "
+              f"{struct_iou:7.3f} ({struct_match:.0%})  [{timing['describe']}]")
+
+    report("torch", reference, ref_detections, ref_structures)
+    for backend in backends:
+        timing, detections, structures, _ = run_backend(backend, pages, crops, args)
+        report(backend, timing, detections, structures)
+
+
+if __name__ == "__main__":
+    main()
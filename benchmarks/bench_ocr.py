@@ -0,0 +1,112 @@
+"""Benchmark OCR: mode 'cell' (satu Tesseract per sel) vs 'batch' (satu per tabel),
+serta mode 'batch' yang disebar ke OcrExecutor dengan beberapa worker.
+
+Contoh:
+    python benchmarks/bench_ocr.py --rows 40 --cols 10
+    python benchmarks/bench_ocr.py --image tabel.png --rows 20 --cols 6
+    python benchmarks/bench_ocr.py --rows 40 --cols 10 --workers 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ekstraktor.ocr import OcrExecutor, ocr_table  # noqa: E402
+from synthetic_text import load_font, random_cell_text  # noqa: E402
+
+
+def make_synthetic_table(rows, cols, cell_w=160, cell_h=40, seed=0):
+    """Membuat gambar tabel bergaris beserta koordinat sel dan isi sebenarnya."""
+    rng = random.Random(seed)
+    font = load_font(int(cell_h * 0.5))
+    image = Image.new("RGB", (cols * cell_w + 1, rows * cell_h + 1), "white")
+    draw = ImageDraw.Draw(image)
+    cells, truth = [], []
+    for r in range(rows):
+        row_cells, row_truth = [], []
+        for c in range(cols):
+            box = [c * cell_w, r * cell_h, (c + 1) * cell_w, (r + 1) * cell_h]
+            text = random_cell_text(rng)
+            draw.rectangle(box, outline="black")
+            draw.text((box[0] + 8, box[1] + cell_h * 0.2), text, fill="black", font=font)
+            row_cells.append(box)
+            row_truth.append(text)
+        cells.append(row_cells)
+        truth.append(row_truth)
+    return image, cells, truth
+
+
+def uniform_grid(image, rows, cols):
+    cell_w, cell_h = image.width / cols, image.height / rows
+    return [[[c * cell_w, r * cell_h, (c + 1) * cell_w, (r + 1) * cell_h] for c in range(cols)] for r in range(rows)]
+
+
+def agreement(table_a, table_b):
+    pairs = [(a, b) for row_a, row_b in zip(table_a, table_b) for a, b in zip(row_a, row_b)]
+    if not pairs:
+        return 0.0
+    return sum(a == b for a, b in pairs) / len(pairs)
+
+
+def run_mode(image, cells, mode, repeat):
+    n_cells = sum(len(row) for row in cells)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        table_data, fallback_cells = ocr_table(image, cells, mode=mode)
+    elapsed = time.perf_counter() - start
+    return table_data, fallback_cells, n_cells * repeat / elapsed, elapsed / repeat
+
+
+def run_pool(image, cells, workers, repeat):
+    n_cells = sum(len(row) for row in cells)
+    executor = OcrExecutor(workers=workers, mode="batch")
+    try:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            table_data, fallback_cells = executor.ocr_tables([(image, cells)])[0]
+        elapsed = time.perf_counter() - start
+    finally:
+        executor.shutdown()
+    return table_data, fallback_cells, n_cells * repeat / elapsed, elapsed / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=40)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--image", help="Gambar tabel nyata (dipotong rata sesuai --rows/--cols)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="Jika > 1, ukur juga OcrExecutor dengan N worker")
+    args = parser.parse_args()
+
+    truth = None
+    if args.image:
+        image = Image.open(args.image).convert("RGB")
+        cells = uniform_grid(image, args.rows, args.cols)
+    else:
+        image, cells, truth = make_synthetic_table(args.rows, args.cols, seed=args.seed)
+
+    print(f"Tabel {args.rows}x{args.cols} ({args.rows * args.cols} sel), ulangan {args.repeat}x")
+    results = {}
+    runs = [("cell", lambda: run_mode(image, cells, "cell", args.repeat)),
+            ("batch", lambda: run_mode(image, cells, "batch", args.repeat))]
+    if args.workers > 1:
+        runs.append((f"pool{args.workers}", lambda: run_pool(image, cells, args.workers, args.repeat)))
+    for name, run in runs:
+        table_data, fallback_cells, cells_per_sec, seconds = run()
+        results[name] = table_data
+        line = f"  {name:<7}: {cells_per_sec:8.1f} sel/detik, {seconds:7.2f} detik/tabel, fallback {fallback_cells} sel"
+        if truth is not None:
+            line += f", akurasi {agreement(table_data, truth):.1%}"
+        print(line)
+    print(f"  Kesesuaian batch vs cell: {agreement(results['batch'], results['cell']):.1%}")
+
+
+if __name__ == "__main__":
+    main()
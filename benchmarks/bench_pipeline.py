@@ -0,0 +1,315 @@
+"""Benchmark pipeline end-to-end pada PDF sintetis dengan ground truth.
+
+PDF dibuat ulang secara deterministik dari parameter korpus (lihat synthetic_pdf.py),
+diekstrak tanpa GUI lewat ekstraktor.extract_pdf, lalu dilaporkan: halaman/detik dan
+sel/detik (tanpa waktu muat model, yang dilaporkan terpisah), puncak RSS (proses ini
+beserta proses anaknya), dan akurasi per sel terhadap ground truth (total, halaman
+digital, halaman pindaian). Hasil disimpan sebagai JSON
+beserta commit git, sehingga dua commit bisa dibandingkan dengan --compare.
+
+Contoh:
+    python benchmarks/bench_pipeline.py --pages 20 --tables 2 --rows 15 --cols 6 --scanned-ratio 0.5
+    python benchmarks/bench_pipeline.py --pages 10 --text-layer off --save hasil_ocr.json
+    python benchmarks/bench_pipeline.py --compare benchmarks/hasil/a1b2c3d.json benchmarks/hasil/e4f5a6b.json
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+from synthetic_pdf import generate_pdf  # noqa: E402
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "hasil")
+RSS_SAMPLE_INTERVAL = 0.2
+# Metrik yang ditampilkan oleh --compare: (kunci di "summary", label, True jika makin besar makin baik)
+COMPARE_METRICS = [
+    ("pages_per_second", "halaman/detik", True),
+    ("cells_per_second", "sel/detik", True),
+    ("wall_seconds", "waktu total (s)", False),
+    ("load_seconds", "muat model (s)", False),
+    ("peak_rss_mb", "puncak RSS (MB)", False),
+    ("accuracy", "akurasi sel", True),
+    ("accuracy_digital", "akurasi digital", True),
+    ("accuracy_scanned", "akurasi pindaian", True),
+    ("tables_found_ratio", "tabel ditemukan", True),
+]
+
+
+def git_commit():
+    """(hash singkat, ada perubahan belum di-commit) atau (None, None) di luar repo git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit, bool(dirty)
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+class RssSampler(threading.Thread):
+    """Mencatat puncak RSS proses ini beserta proses anaknya (pool OCR, Tesseract, Poppler)."""
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        from ekstraktor.memory import process_rss
+
+        self.process_rss = process_rss
+        self.interval = interval
+        self.peak = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.peak = max(self.peak, self.process_rss())
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        self.peak = max(self.peak, self.process_rss())
+        return self.peak
+
+
+def normalize(text):
+    return " ".join(str(text).split())
+
+
+def read_output(csv_path):
+    """Membaca CSV output menjadi {halaman: {tabel: [baris sel]}}."""
+    pages = {}
+    if not os.path.exists(csv_path):
+        return pages
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            page_tables = pages.setdefault(int(row[0]), {})
+            page_tables.setdefault(int(row[1]), []).append(row[2:])
+    return pages
+
+
+def table_correct_cells(truth, extracted):
+    """Jumlah sel yang teksnya sama persis pada posisi (baris, kolom) yang sama."""
+    correct = 0
+    for truth_row, row in zip(truth, extracted):
+        correct += sum(normalize(a) == normalize(b) for a, b in zip(truth_row, row))
+    return correct
+
+
+def score_page(truth_tables, extracted_tables):
+    """(sel benar, tabel ditemukan) untuk satu halaman.
+
+    Urutan tabel hasil deteksi belum tentu sama dengan urutan di halaman, jadi setiap
+    tabel ground truth dipasangkan dengan tabel hasil yang paling cocok.
+    """
+    unused = list(extracted_tables.values())
+    correct = 0
+    for truth in truth_tables:
+        scores = [table_correct_cells(truth, table) for table in unused]
+        if not scores:
+            break
+        best = max(range(len(scores)), key=scores.__getitem__)
+        correct += scores[best]
+        unused.pop(best)
+    return correct, min(len(truth_tables), len(extracted_tables))
+
+
+def score_output(truth, csv_path):
+    extracted = read_output(csv_path)
+    totals = {kind: {"cells": 0, "correct": 0} for kind in ("digital", "scanned")}
+    tables_expected = tables_found = 0
+    for page in truth["pages"]:
+        correct, found = score_page(page["tables"], extracted.get(page["page"], {}))
+        totals[page["kind"]]["cells"] += sum(len(row) for table in page["tables"] for row in table)
+        totals[page["kind"]]["correct"] += correct
+        tables_expected += len(page["tables"])
+        tables_found += found
+    cells = sum(t["cells"] for t in totals.values())
+    correct = sum(t["correct"] for t in totals.values())
+
+    def ratio(a, b):
+        return round(a / b, 4) if b else None
+
+    return {
+        "cells": cells,
+        "accuracy": ratio(correct, cells),
+        "accuracy_digital": ratio(totals["digital"]["correct"], totals["digital"]["cells"]),
+        "accuracy_scanned": ratio(totals["scanned"]["correct"], totals["scanned"]["cells"]),
+        "tables_found_ratio": ratio(tables_found, tables_expected),
+    }
+
+
+def run_once(pdf_path, truth, workdir, options, verbose):
+    from ekstraktor import extract_pdf
+
+    output_csv = os.path.join(workdir, "hasil.csv")
+    # Setiap ulangan mulai dari output kosong agar tidak ada halaman yang dilewati resume
+    for name in os.listdir(workdir):
+        if name.startswith("hasil."):
+            os.remove(os.path.join(workdir, name))
+
+    def on_message(msg_type, message):
+        if msg_type == "ERROR" or (verbose and msg_type == "LOG"):
+            print(str(message).strip("\n"), file=sys.stderr, flush=True)
+
+    sampler = RssSampler()
+    sampler.start()
+    start = time.perf_counter()
+    summary = extract_pdf(pdf_path, output_csv, image_dir=os.path.join(workdir, "gambar"),
+                          on_message=on_message, **options)
+    wall = time.perf_counter() - start
+    peak_rss = sampler.stop()
+    if summary["status"] != "done":
+        raise RuntimeError(f"Ekstraksi gagal: {summary['error'] or summary['status']}")
+
+    metrics_path = output_csv + ".metrics.json"
+    if not os.path.exists(metrics_path):
+        raise RuntimeError(f"Metrik pipeline tidak ditemukan: {metrics_path}")
+    with open(metrics_path, encoding="utf-8") as f:
+        stages = json.load(f)
+    # Selama model dimuat tahap deteksi berhenti; throughput hanya dihitung dari waktu sisanya
+    load = stages["model_load_seconds"]
+    processing = max(wall - load, 1e-9)
+    result = score_output(truth, output_csv)
+    result.update({
+        "wall_seconds": round(wall, 3),
+        "load_seconds": round(load, 3),
+        "processing_seconds": round(processing, 3),
+        "pages_per_second": round(len(truth["pages"]) / processing, 4),
+        "cells_per_second": round(result["cells"] / processing, 2),
+        "peak_rss_mb": round(peak_rss / 1024 / 1024, 1),
+    })
+    result["stages"] = stages
+    return result
+
+
+def print_run(index, result):
+    def pct(value):
+        return "-" if value is None else f"{value:.1%}"
+
+    print(f"  #{index}: {result['wall_seconds']:7.2f}s (muat model {result['load_seconds']:.2f}s), "
+          f"{result['pages_per_second']:6.2f} hlm/s, "
+          f"{result['cells_per_second']:8.1f} sel/s, RSS {result['peak_rss_mb']:7.1f} MB, "
+          f"akurasi {pct(result['accuracy'])} (digital {pct(result['accuracy_digital'])}, "
+          f"pindaian {pct(result['accuracy_scanned'])}), tabel {pct(result['tables_found_ratio'])}")
+
+
+def compare(path_a, path_b):
+    with open(path_a, encoding="utf-8") as f:
+        a = json.load(f)
+    with open(path_b, encoding="utf-8") as f:
+        b = json.load(f)
+    print(f"A: {path_a} (commit {a['git_commit']}{'+' if a['git_dirty'] else ''})")
+    print(f"B: {path_b} (commit {b['git_commit']}{'+' if b['git_dirty'] else ''})")
+    if a["corpus"] != b["corpus"] or a["options"] != b["options"]:
+        print("!!! Korpus atau opsi berbeda; perbandingan mungkin tidak sebanding.")
+    print(f"  {'metrik':<18} {'A':>12} {'B':>12} {'perubahan':>10}")
+    for key, label, higher_is_better in COMPARE_METRICS:
+        value_a, value_b = a["summary"].get(key), b["summary"].get(key)
+        if value_a is None or value_b is None:
+            continue
+        change = (value_b - value_a) / value_a if value_a else 0.0
+        better = change > 0 if higher_is_better else change < 0
+        mark = "" if abs(change) < 0.02 else ("(lebih baik)" if better else "(lebih buruk)")
+        print(f"  {label:<18} {value_a:>12g} {value_b:>12g} {change:>+9.1%} {mark}".rstrip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    corpus = parser.add_argument_group("korpus sintetis")
+    corpus.add_argument("--pages", type=int, default=8)
+    corpus.add_argument("--tables", type=int, default=1, help="Jumlah tabel per halaman")
+    corpus.add_argument("--rows", type=int, default=12)
+    corpus.add_argument("--cols", type=int, default=5)
+    corpus.add_argument("--scanned-ratio", type=float, default=0.5, help="Porsi halaman hasil pindaian (0..1)")
+    corpus.add_argument("--seed", type=int, default=0)
+    pipeline = parser.add_argument_group("opsi pipeline (diteruskan ke extract_pdf)")
+    pipeline.add_argument("--dpi", type=int)
+    pipeline.add_argument("--ocr-mode", choices=["batch", "cell"])
+    pipeline.add_argument("--ocr-workers", type=int)
+    pipeline.add_argument("--batch-size", type=int)
+    pipeline.add_argument("--text-layer", choices=["off", "cells", "full"])
+    pipeline.add_argument("--detection-backend", choices=["torch", "int8", "onnx"])
+    pipeline.add_argument("--structure-backend", choices=["torch", "int8", "onnx"])
+    parser.add_argument("--repeat", type=int, default=1, help="Jumlah ulangan; ringkasan memakai median")
+    parser.add_argument("--save", help=f"Path hasil JSON (default: {os.path.relpath(RESULTS_DIR, REPO_DIR)}/<commit>-<waktu>.json)")
+    parser.add_argument("--workdir", help="Folder kerja (default: folder sementara yang dihapus setelah selesai)")
+    parser.add_argument("--compare", nargs=2, metavar=("A.json", "B.json"), help="Bandingkan dua hasil lalu keluar")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Tampilkan log pipeline")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    options = {
+        "dpi": args.dpi,
+        "ocr_mode": args.ocr_mode,
+        "ocr_workers": args.ocr_workers,
+        "batch_size": args.batch_size,
+        "text_layer": args.text_layer,
+        "detection_backend": args.detection_backend,
+        "structure_backend": args.structure_backend,
+    }
+    options = {key: value for key, value in options.items() if value is not None}
+    # Cache hasil dimatikan agar setiap ulangan benar-benar menjalankan inferensi dan OCR
+    options["result_cache_path"] = None
+    # Waktu muat model dibaca dari <output>.metrics.json
+    options["metrics_export"] = True
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="bench_pipeline_")
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        pdf_path = os.path.join(workdir, "korpus.pdf")
+        truth = generate_pdf(pdf_path, args.pages, args.tables, args.rows, args.cols, args.scanned_ratio,
+                             args.seed, dpi=args.dpi or 200)
+        scanned = sum(page["kind"] == "scanned" for page in truth["pages"])
+        print(f"Korpus: {args.pages} halaman ({scanned} pindaian), {args.tables} tabel {args.rows}x{args.cols} "
+              f"per halaman, seed {args.seed}")
+
+        runs = []
+        for index in range(1, args.repeat + 1):
+            runs.append(run_once(pdf_path, truth, workdir, options, args.verbose))
+            print_run(index, runs[-1])
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    median_run = sorted(runs, key=lambda run: run["wall_seconds"])[len(runs) // 2]
+    summary = {key: value for key, value in median_run.items() if key != "stages"}
+    if len(runs) > 1:
+        summary["wall_seconds_stdev"] = round(statistics.stdev(run["wall_seconds"] for run in runs), 3)
+    commit, dirty = git_commit()
+    result = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": commit,
+        "git_dirty": dirty,
+        "corpus": truth["params"],
+        "options": options,
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpu_count": os.cpu_count()},
+        "summary": summary,
+        "stages": median_run.get("stages"),
+        "runs": [{key: value for key, value in run.items() if key != "stages"} for run in runs],
+    }
+    save_path = args.save or os.path.join(RESULTS_DIR, f"{commit or 'tanpa-git'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(save_path)), exist_ok=True)
+    with open(save_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"Hasil disimpan ke {save_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""PDF sintetis berisi tabel bergaris beserta ground truth, dibuat tanpa pustaka PDF.
+
+Halaman 'digital' berisi teks asli (Helvetica) sehingga punya lapisan teks; halaman
+'scanned' hanya berisi gambar JPEG hasil render tabel yang sama, seperti hasil pindaian.
+Isi tabel ditentukan sepenuhnya oleh `seed`, jadi korpus yang sama bisa dibuat ulang
+di komputer mana pun.
+
+Contoh:
+    python benchmarks/synthetic_pdf.py korpus.pdf --pages 10 --tables 2 --rows 12 --cols 5
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic_text import load_font, random_cell_text  # noqa: E402
+
+# A4 dalam point (1/72 inci)
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+PAGE_MARGIN = 40
+TABLE_GAP = 36
+MAX_CELL_HEIGHT = 22
+MIN_CELL_HEIGHT = 12
+SCAN_JPEG_QUALITY = 85
+
+
+def table_layout(tables, rows, cols):
+    """Kotak sel setiap tabel dalam point, origin kiri atas: [tabel][baris][kolom] -> [x0, y0, x1, y1]."""
+    cell_w = (PAGE_WIDTH - 2 * PAGE_MARGIN) / cols
+    usable_h = PAGE_HEIGHT - 2 * PAGE_MARGIN - TABLE_GAP * (tables - 1)
+    cell_h = min(MAX_CELL_HEIGHT, usable_h / (tables * rows))
+    if cell_h < MIN_CELL_HEIGHT:
+        raise ValueError(f"{tables} tabel x {rows} baris tidak muat di satu halaman")
+    layout, top = [], PAGE_MARGIN
+    for _ in range(tables):
+        layout.append([[[PAGE_MARGIN + c * cell_w, top + r * cell_h, PAGE_MARGIN + (c + 1) * cell_w, top + (r + 1) * cell_h]
+                        for c in range(cols)] for r in range(rows)])
+        top += rows * cell_h + TABLE_GAP
+    font_size = min(cell_h * 0.55, cell_w / 5.5, 11)
+    return layout, font_size
+
+
+def _pdf_string(text):
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def digital_page_content(layout, texts, font_size):
+    """Content stream halaman digital: garis tabel dan teks sel (koordinat PDF, origin kiri bawah)."""
+    ops = ["0.5 w"]
+    for table in layout:
+        x0, x1 = table[0][0][0], table[0][-1][2]
+        y0, y1 = table[0][0][1], table[-1][0][3]
+        for row in table:
+            ops.append(f"{x0:.2f} {PAGE_HEIGHT - row[0][1]:.2f} m {x1:.2f} {PAGE_HEIGHT - row[0][1]:.2f} l")
+        ops.append(f"{x0:.2f} {PAGE_HEIGHT - y1:.2f} m {x1:.2f} {PAGE_HEIGHT - y1:.2f} l")
+        for cell in table[0]:
+            ops.append(f"{cell[0]:.2f} {PAGE_HEIGHT - y0:.2f} m {cell[0]:.2f} {PAGE_HEIGHT - y1:.2f} l")
+        ops.append(f"{x1:.2f} {PAGE_HEIGHT - y0:.2f} m {x1:.2f} {PAGE_HEIGHT - y1:.2f} l")
+        ops.append("S")
+    ops.append(f"BT /F1 {font_size:.2f} Tf")
+    for table, table_texts in zip(layout, texts):
+        for row, row_texts in zip(table, table_texts):
+            for cell, text in zip(row, row_texts):
+                baseline = PAGE_HEIGHT - cell[3] + (cell[3] - cell[1] - font_size) / 2 + font_size * 0.2
+                ops.append(f"1 0 0 1 {cell[0] + 4:.2f} {baseline:.2f} Tm {_pdf_string(text)} Tj")
+    ops.append("ET")
+    return "\n".join(ops).encode("latin-1")
+
+
+def scanned_page_jpeg(layout, texts, font_size, dpi):
+    """Render halaman yang sama sebagai gambar grayscale JPEG, seperti hasil pindaian."""
+    from PIL import Image, ImageDraw
+
+    scale = dpi / 72
+    image = Image.new("L", (round(PAGE_WIDTH * scale), round(PAGE_HEIGHT * scale)), 255)
+    draw = ImageDraw.Draw(image)
+    font = load_font(round(font_size * scale))
+    for table, table_texts in zip(layout, texts):
+        for row, row_texts in zip(table, table_texts):
+            for cell, text in zip(row, row_texts):
+                box = [round(v * scale) for v in cell]
+                draw.rectangle(box, outline=0, width=max(1, round(scale / 2)))
+                draw.text((box[0] + 4 * scale, box[1] + (box[3] - box[1] - font_size * scale) / 2), text, fill=0, font=font)
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=SCAN_JPEG_QUALITY)
+    return image.size, buffer.getvalue()
+
+
+class PdfBuilder:
+    """Penulis PDF 1.4 minimal: objek bernomor, tabel xref, dan trailer."""
+    def __init__(self):
+        self.objects = []
+
+    def add(self, body=None):
+        self.objects.append(body)
+        return len(self.objects)
+
+    def set(self, number, body):
+        self.objects[number - 1] = body
+
+    def add_stream(self, dictionary, data):
+        prefix = b"<< " + dictionary + b" " if dictionary else b"<< "
+        return self.add(prefix + b"/Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+
+    def save(self, path, root):
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(self.objects, 1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(self.objects) + 1)
+        for offset in offsets:
+            out += b"%010d 00000 n \n" % offset
+        out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(self.objects) + 1, root, xref)
+        with open(path, "wb") as f:
+            f.write(out)
+
+
+def generate_pdf(path, pages=4, tables=1, rows=10, cols=5, scanned_ratio=0.5, seed=0, dpi=200):
+    """Menulis PDF sintetis ke `path` dan mengembalikan ground truth-nya (dict, bisa di-JSON-kan)."""
+    rng = random.Random(seed)
+    layout, font_size = table_layout(tables, rows, cols)
+    scanned = set(rng.sample(range(1, pages + 1), round(pages * scanned_ratio)))
+
+    pdf = PdfBuilder()
+    catalog, pages_obj = pdf.add(), pdf.add()
+    font = pdf.add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    kids, truth_pages = [], []
+    for page_num in range(1, pages + 1):
+        texts = [[[random_cell_text(rng) for _ in range(cols)] for _ in range(rows)] for _ in range(tables)]
+        kind = "scanned" if page_num in scanned else "digital"
+        if kind == "digital":
+            content = pdf.add_stream(b"", digital_page_content(layout, texts, font_size))
+            resources = b"<< /Font << /F1 %d 0 R >> >>" % font
+        else:
+            (width, height), jpeg = scanned_page_jpeg(layout, texts, font_size, dpi)
+            image = pdf.add_stream(b"/Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray "
+                                   b"/BitsPerComponent 8 /Filter /DCTDecode" % (width, height), jpeg)
+            content = pdf.add_stream(b"", b"q %d 0 0 %d 0 0 cm /Im1 Do Q" % (PAGE_WIDTH, PAGE_HEIGHT))
+            resources = b"<< /XObject << /Im1 %d 0 R >> >>" % image
+        kids.append(pdf.add(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>"
+                            % (pages_obj, PAGE_WIDTH, PAGE_HEIGHT, resources, content)))
+        truth_pages.append({"page": page_num, "kind": kind, "tables": texts})
+    pdf.set(pages_obj, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)))
+    pdf.set(catalog, b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj)
+    pdf.save(path, catalog)
+    return {
+        "params": {"pages": pages, "tables": tables, "rows": rows, "cols": cols,
+                   "scanned_ratio": scanned_ratio, "seed": seed, "dpi": dpi},
+        "pages": truth_pages,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="Path PDF; ground truth ditulis ke <output>.truth.json")
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--tables", type=int, default=1, help="Jumlah tabel per halaman")
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--cols", type=int, default=5)
+    parser.add_argument("--scanned-ratio", type=float, default=0.5, help="Porsi halaman hasil pindaian (0..1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dpi", type=int, default=200, help="Resolusi gambar halaman pindaian")
+    args = parser.parse_args()
+
+    truth = generate_pdf(args.output, args.pages, args.tables, args.rows, args.cols, args.scanned_ratio, args.seed, args.dpi)
+    with open(args.output + ".truth.json", "w", encoding="utf-8") as f:
+        json.dump(truth, f)
+    scanned = sum(page["kind"] == "scanned" for page in truth["pages"])
+    print(f"{args.output}: {args.pages} halaman ({scanned} pindaian), {args.tables} tabel {args.rows}x{args.cols} per halaman")
+
+
+if __name__ == "__main__":
+    main()
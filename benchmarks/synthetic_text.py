@@ -0,0 +1,23 @@
+"""Isi sel dan font untuk tabel sintetis benchmark, tanpa dependensi ekstraktor.
+
+PIL baru diimpor saat font dibutuhkan, jadi synthetic_pdf.py bisa membuat halaman
+digital tanpa Tesseract maupun PIL terpasang.
+"""
+WORDS = ["Sungai", "Debit", "Curah", "Hujan", "Stasiun", "Total", "Rata", "Januari", "Maret", "Bandung"]
+
+
+def load_font(size):
+    from PIL import ImageFont
+
+    for name in ("DejaVuSans.ttf", "arial.ttf", "Arial.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def random_cell_text(rng):
+    if rng.random() < 0.5:
+        return f"{rng.uniform(0, 9999):.2f}"
+    return rng.choice(WORDS)
@@ -0,0 +1,13 @@
+"""Ekstraktor Tabel PDF Cerdas: pipeline ekstraksi tabel yang bisa dipakai tanpa GUI.
+
+Mengimpor paket ini ringan; torch dan transformers baru dimuat saat dibutuhkan.
+"""
+__version__ = "2.0"
+__all__ = ["extract_pdf", "run_batch", "find_pending_pages"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import api
+        return getattr(api, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,130 @@
+"""API tanpa GUI untuk menjalankan ekstraksi satu dokumen atau batch di proses ini."""
+import multiprocessing
+import threading
+import time
+from pathlib import Path
+
+from .batch import batch_worker, collect_pdf_paths
+from .pages import IMAGE_CACHE_DIR, PdfPageSource
+from .pipeline import extraction_worker
+from .writers import OUTPUT_FORMATS, load_progress
+
+
+def default_output_path(pdf_path):
+    return Path(pdf_path).stem + "_hasil.csv"
+
+def find_pending_pages(output_csv, total_pages, output_formats=OUTPUT_FORMATS):
+    """Daftar halaman yang belum selesai menurut manifest output (bisa tidak berurutan).
+
+    Tidak membaca isi output kecuali manifest belum ada; lihat writers.load_progress.
+    """
+    return load_progress(output_csv, total_pages, output_formats).pending_pages(total_pages)
+
+class MessageSink:
+    """Pengganti multiprocessing.Queue saat worker dijalankan di proses yang sama.
+
+    Mencatat progres, halaman gagal, status akhir, dan error, lalu meneruskan setiap pesan
+    ke `on_message`.
+    """
+    def __init__(self, on_message=None):
+        self.on_message = on_message
+        self.pages_total = None
+        self.pages_done = 0
+        self.failed_pages = []
+        self.done = False
+        self.error = None
+        self._lock = threading.Lock()
+
+    def put(self, msg):
+        msg_type, message = msg
+        with self._lock:
+            if msg_type == "PROGRESS":
+                self.pages_done += 1
+            elif msg_type == "TOTAL":
+                self.pages_total = message
+            elif msg_type == "PAGE_FAILED":
+                self.failed_pages.append(message)
+            elif msg_type == "DONE":
+                self.done = True
+            elif msg_type == "ERROR":
+                self.error = message
+        if self.on_message is not None:
+            self.on_message(msg_type, message)
+
+def _finish_summary(summary, sink, stop_signal, started):
+    """Status akhir: 'error', 'stopped', 'incomplete' (ada halaman tertunda yang gagal), atau 'done'."""
+    elapsed = time.monotonic() - started
+    if sink.pages_total is not None:
+        summary["pages_pending"] = sink.pages_total
+    summary["pages_processed"] = sink.pages_done
+    summary["failed_pages"] = sink.failed_pages
+    summary["elapsed_seconds"] = round(elapsed, 3)
+    summary["pages_per_minute"] = round(sink.pages_done / (elapsed / 60), 2) if elapsed > 0 else 0.0
+    if sink.error is not None:
+        summary["status"], summary["error"] = "error", sink.error
+    elif stop_signal.is_set():
+        summary["status"] = "stopped"
+    elif sink.failed_pages or sink.pages_done < summary["pages_pending"]:
+        # Halaman gagal tetap tertunda di manifest dan dicoba lagi saat resume
+        summary["status"] = "incomplete"
+    else:
+        summary["status"] = "done"
+    return summary
+
+def extract_pdf(pdf_path, output_csv=None, start_page=None, image_dir=IMAGE_CACHE_DIR,
+                stop_signal=None, on_message=None, **options):
+    """Mengekstrak tabel dari satu PDF tanpa GUI, dengan semantik resume yang sama.
+
+    Halaman yang sudah tercatat selesai di manifest output selalu dilewati; `start_page`
+    hanya membatasi halaman tertunda mulai dari halaman tersebut.
+    `options` diteruskan ke extraction_worker (ocr_mode, ocr_workers, batch_size, dpi, ...).
+    Mengembalikan ringkasan berupa dict yang bisa diserialisasi ke JSON.
+    """
+    output_csv = output_csv or default_output_path(pdf_path)
+    stop_signal = stop_signal or threading.Event()
+    started = time.monotonic()
+    summary = {
+        "mode": "single", "pdf": pdf_path, "output": output_csv, "status": None, "error": None,
+        "total_pages": None, "start_page": None, "pages_pending": 0, "pages_processed": 0, "failed_pages": [],
+        "elapsed_seconds": 0.0, "pages_per_minute": 0.0,
+    }
+    try:
+        total_pages = PdfPageSource(pdf_path).page_count()
+        pages = find_pending_pages(output_csv, total_pages, options.get("output_formats", OUTPUT_FORMATS))
+    except Exception as e:
+        summary.update(status="error", error=f"Persiapan gagal: {e}")
+        return summary
+    if start_page is not None:
+        pages = [page_num for page_num in pages if page_num >= start_page]
+    summary["total_pages"] = total_pages
+    if not pages:
+        summary["status"] = "complete"
+        return summary
+    summary["start_page"] = pages[0]
+    summary["pages_pending"] = len(pages)
+
+    sink = MessageSink(on_message)
+    extraction_worker(sink, pdf_path, image_dir, output_csv, pages, stop_signal, **options)
+    return _finish_summary(summary, sink, stop_signal, started)
+
+def run_batch(inputs, output_dir, stop_signal=None, on_message=None, **options):
+    """Memproses banyak PDF (file dan/atau folder) dengan worker berumur panjang.
+
+    `options` diteruskan ke batch_worker (num_workers, ocr_mode, batch_size, dpi, ...).
+    """
+    # Worker batch adalah proses terpisah, jadi sinyal berhenti harus multiprocessing.Event
+    stop_signal = stop_signal or multiprocessing.Event()
+    pdf_paths = collect_pdf_paths(inputs)
+    started = time.monotonic()
+    summary = {
+        "mode": "batch", "inputs": list(inputs), "output_dir": output_dir, "documents": len(pdf_paths),
+        "status": None, "error": None, "pages_pending": 0, "pages_processed": 0, "failed_pages": [],
+        "elapsed_seconds": 0.0, "pages_per_minute": 0.0,
+    }
+    if not pdf_paths:
+        summary.update(status="error", error="Tidak ada file PDF yang ditemukan.")
+        return summary
+
+    sink = MessageSink(on_message)
+    batch_worker(sink, pdf_paths, output_dir, stop_signal, **options)
+    return _finish_summary(summary, sink, stop_signal, started)
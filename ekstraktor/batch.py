@@ -0,0 +1,345 @@
+"""Mode batch: halaman dari banyak PDF dijadwalkan ke beberapa worker berumur panjang."""
+import multiprocessing
+import os
+import signal
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from queue import Empty
+
+from .cache import RESULT_CACHE_PATH, RESULT_CACHE_MAX_BYTES, ResultCache, file_sha256, result_cache_settings
+from .memory import WORKER_MEMORY_LIMIT_MB, MEMORY_SHRINK, MEMORY_RESTART, MemoryGovernor, worker_memory_limit
+from .metrics import METRICS_EXPORT, PipelineMetrics
+from .models import (
+    INFERENCE_BATCH_SIZE, DETECTION_BACKEND, STRUCTURE_BACKEND, MODEL_SNAPSHOT_DIR, MODEL_OFFLINE, TableModels
+)
+from .ocr import OCR_MODE, OCR_WORKERS, OCR_EXECUTOR, OcrExecutor
+from .pages import PDF_DPI, RASTER_WINDOW, PdfPageSource, page_runs
+from .textlayer import TEXT_LAYER_MODE, TextLayer
+from .pipeline import (
+    lookup_cached_page, prepare_rendered_page, detect_pages, recognize_pages, ocr_page,
+    page_to_cache, page_cell_count, count_page, timed_stage
+)
+from .writers import OUTPUT_FORMATS, COMMIT_EVERY_PAGES, ProgressManifest, TableWriter, load_progress
+
+# ===================================================================
+# MODE BATCH: HALAMAN DARI BANYAK DOKUMEN DIJADWALKAN KE BEBERAPA WORKER
+# ===================================================================
+# Setiap worker memuat model sendiri dan memiliki pool OCR sendiri
+BATCH_WORKERS = max(1, (os.cpu_count() or 1) // 8)
+BATCH_REPORT_INTERVAL = 15.0
+
+@dataclass
+class BatchDocument:
+    pdf_path: str
+    output_csv: str
+    pdf_hash: str
+    total_pages: int
+    manifest: ProgressManifest
+    pending: list
+    writer: TableWriter
+
+def collect_pdf_paths(inputs):
+    """Mengumpulkan file PDF dari daftar path; direktori dipindai (tidak rekursif)."""
+    pdf_paths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            pdf_paths.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(".pdf")
+            ))
+        else:
+            pdf_paths.append(path)
+    return pdf_paths
+
+def plan_batch_documents(queue, pdf_paths, output_dir, dpi=PDF_DPI,
+                         output_formats=OUTPUT_FORMATS, commit_every=COMMIT_EVERY_PAGES):
+    """Menyiapkan output, manifest, dan daftar halaman tertunda untuk setiap PDF."""
+    documents = []
+    used_names = set()
+    for pdf_path in pdf_paths:
+        stem = Path(pdf_path).stem
+        name, suffix = stem, 2
+        while name in used_names:
+            name, suffix = f"{stem}_{suffix}", suffix + 1
+        used_names.add(name)
+        output_csv = os.path.join(output_dir, f"{name}_hasil.csv")
+        try:
+            total_pages = PdfPageSource(pdf_path, dpi=dpi).page_count()
+            pdf_hash = file_sha256(pdf_path)
+            manifest = load_progress(output_csv, total_pages, output_formats)
+        except Exception as e:
+            queue.put(("LOG", f"!!! Gagal membaca {pdf_path}: {e}. Dokumen dilewati."))
+            queue.put(("PAGE_FAILED", {"pdf": pdf_path, "page": None, "error": f"Gagal membaca dokumen: {e}"}))
+            continue
+        writer = TableWriter(output_csv, formats=output_formats, commit_every=commit_every, manifest=manifest)
+        pending = manifest.pending_pages(total_pages)
+        documents.append(BatchDocument(pdf_path, output_csv, pdf_hash, total_pages, manifest, pending, writer))
+        if pending:
+            queue.put(("LOG", f">>> {os.path.basename(pdf_path)}: {len(pending)} dari {total_pages} halaman tertunda."))
+        else:
+            queue.put(("LOG", f">>> {os.path.basename(pdf_path)}: sudah selesai, dilewati."))
+    return documents
+
+def batch_tasks(documents, window=RASTER_WINDOW):
+    """Membagi halaman tertunda semua dokumen menjadi tugas (doc_id, pdf_path, pdf_hash, halaman)."""
+    for doc_id, doc in enumerate(documents):
+        for run in page_runs(doc.pending, window):
+            yield doc_id, doc.pdf_path, doc.pdf_hash, run
+
+def batch_page_worker(worker_id, task_queue, result_queue, stop_signal, options):
+    """Worker berumur panjang: memuat model sekali, lalu memproses tugas halaman dari banyak dokumen."""
+    # Ctrl+C ditangani proses koordinator lewat stop_signal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    ocr_pool = None
+    result_cache = None
+    try:
+        models = TableModels(batch_size=options["batch_size"], snapshot_dir=options["model_dir"],
+                             detection_backend=options["detection_backend"],
+                             structure_backend=options["structure_backend"], offline=options["model_offline"])
+        load_start = time.perf_counter()
+        models.load()
+        load_seconds = time.perf_counter() - load_start
+        ocr_pool = OcrExecutor(workers=options["ocr_workers"], kind=options["ocr_executor"], mode=options["ocr_mode"])
+        if options["result_cache_path"]:
+            result_cache = ResultCache(options["result_cache_path"], options["result_cache_max_bytes"])
+        cache_settings = result_cache_settings(options["dpi"], options["ocr_mode"],
+                                               options["detection_backend"], options["structure_backend"],
+                                               options["text_layer"])
+        governor = MemoryGovernor(options["memory_limit"], models, ocr_pool)
+        metrics = PipelineMetrics()
+        metrics.observe_model_load(load_seconds)
+        result_queue.put(("READY", worker_id, models.describe()))
+
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            doc_id, pdf_path, pdf_hash, page_numbers = task
+            if stop_signal.is_set():
+                # Tugas dikembalikan tanpa diproses; halamannya tetap tertunda di manifest
+                result_queue.put(("TASK_DONE", worker_id, 0))
+                continue
+            pages, to_render = [], []
+            for page_num in page_numbers:
+                cached_page = None
+                if result_cache is not None:
+                    cached_page = lookup_cached_page(result_cache, pdf_hash, page_num, cache_settings)
+                if cached_page is None:
+                    to_render.append(page_num)
+                else:
+                    pages.append(cached_page)
+
+            def report_raster_error(page_num, e):
+                result_queue.put(("PAGE_ERROR", doc_id, page_num, f"Gagal merasterisasi: {e}"))
+
+            source = PdfPageSource(pdf_path, dpi=options["dpi"])
+            text_source = None
+            if options["text_layer"] != "off" and to_render:
+                text_source = TextLayer(pdf_path, options["dpi"], window=len(page_numbers))
+            start = time.perf_counter()
+            for page_num, image in source.iter_pages(to_render, on_error=report_raster_error):
+                metrics.observe("rasterize", time.perf_counter() - start, pages=1)
+                page = prepare_rendered_page(result_cache, pdf_hash, page_num, image, cache_settings)
+                if text_source is not None and not page.from_cache:
+                    page.words = text_source.page_words(page_num)
+                    if page.words is not None:
+                        metrics.count("pages_text_layer")
+                pages.append(page)
+                start = time.perf_counter()
+            pages.sort(key=lambda page: page.page_num)
+
+            timed_stage(metrics, "detection", lambda batch: detect_pages(models, batch), pages)
+            timed_stage(metrics, "structure", lambda batch: recognize_pages(models, batch, options["text_layer"]), pages)
+            for page in pages:
+                # Halaman yang tidak selesai karena sinyal berhenti tetap tertunda di manifest
+                start = time.perf_counter()
+                if ocr_page(ocr_pool, page, stop_signal) is None:
+                    break
+                if not page.from_cache:
+                    metrics.observe("ocr", time.perf_counter() - start, pages=1, tables=len(page.tables),
+                                    cells=page_cell_count(page))
+                count_page(metrics, page)
+                if result_cache is not None and page.cache_keys:
+                    result_cache.put(page.cache_keys, page_to_cache(page))
+                tables = [(table.index, table.data) for table in page.tables if table.data]
+                result_queue.put(("PAGE", doc_id, page.page_num, tables))
+            # Metrik kumulatif worker ini; koordinator menggabungkan semua worker
+            result_queue.put(("METRICS", worker_id, os.getpid(), metrics.state()))
+            result_queue.put(("TASK_DONE", worker_id, len(page_numbers)))
+
+            # Batas tugas = batas halaman: aman untuk memperkecil jendela atau restart
+            action, rss = governor.check()
+            if action == MEMORY_SHRINK:
+                result_queue.put(("MEMORY", worker_id, f"RSS {rss / 1024 / 1024:.0f} MB, jendela diperkecil ({governor.describe()})"))
+            elif action == MEMORY_RESTART and not stop_signal.is_set():
+                result_queue.put(("WORKER_RESTART", worker_id, f"RSS {rss / 1024 / 1024:.0f} MB melewati batas"))
+                break
+    except Exception as e:
+        result_queue.put(("WORKER_ERROR", worker_id, str(e)))
+    finally:
+        if ocr_pool is not None:
+            ocr_pool.shutdown()
+        if result_cache is not None:
+            result_cache.close()
+
+def batch_worker(queue, pdf_paths, output_dir, stop_signal, num_workers=BATCH_WORKERS,
+                 batch_size=INFERENCE_BATCH_SIZE, ocr_mode=OCR_MODE, ocr_executor=OCR_EXECUTOR, dpi=PDF_DPI,
+                 result_cache_path=RESULT_CACHE_PATH, result_cache_max_bytes=RESULT_CACHE_MAX_BYTES,
+                 output_formats=OUTPUT_FORMATS, commit_every=COMMIT_EVERY_PAGES,
+                 memory_limit_mb=WORKER_MEMORY_LIMIT_MB, detection_backend=DETECTION_BACKEND,
+                 structure_backend=STRUCTURE_BACKEND, model_dir=MODEL_SNAPSHOT_DIR, model_offline=MODEL_OFFLINE,
+                 text_layer=TEXT_LAYER_MODE, metrics_export=METRICS_EXPORT):
+    """Memproses banyak PDF sekaligus dengan `num_workers` worker berumur panjang.
+
+    Output dan manifest resume ditulis per dokumen di `output_dir`. Menggunakan protokol
+    antrean yang sama dengan extraction_worker, ditambah ("TOTAL", jumlah halaman).
+    Worker yang RSS-nya melewati `memory_limit_mb` berhenti setelah tugasnya dan diganti.
+    Metrik semua worker digabung ke `<output_dir>/batch.metrics.json` dan `.metrics.prom`.
+    """
+    workers = []
+    task_queue = multiprocessing.Queue()
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        documents = plan_batch_documents(queue, pdf_paths, output_dir, dpi, output_formats, commit_every)
+        total_pending = sum(len(doc.pending) for doc in documents)
+        queue.put(("TOTAL", total_pending))
+        if not total_pending:
+            queue.put(("DONE", "Semua dokumen sudah selesai diproses."))
+            return
+
+        num_workers = max(1, num_workers)
+        options = {
+            "batch_size": batch_size,
+            "ocr_mode": ocr_mode,
+            "ocr_workers": max(1, OCR_WORKERS // num_workers),
+            "ocr_executor": ocr_executor,
+            "dpi": dpi,
+            "result_cache_path": result_cache_path,
+            "result_cache_max_bytes": result_cache_max_bytes,
+            "memory_limit": worker_memory_limit(memory_limit_mb, num_workers),
+            "detection_backend": detection_backend,
+            "structure_backend": structure_backend,
+            "model_dir": model_dir,
+            "model_offline": model_offline,
+            "text_layer": text_layer,
+        }
+        result_queue = multiprocessing.Queue()
+
+        def start_page_worker(worker_id):
+            worker = multiprocessing.Process(
+                target=batch_page_worker,
+                args=(worker_id, task_queue, result_queue, stop_signal, options)
+            )
+            worker.start()
+            return worker
+
+        workers.extend(start_page_worker(worker_id) for worker_id in range(num_workers))
+        queue.put(("LOG", f">>> Mode batch: {len(documents)} dokumen, {total_pending} halaman, {num_workers} worker."))
+
+        tasks = batch_tasks(documents)
+        tasks_exhausted = False
+        in_flight = 0
+        done_pages = 0
+        remaining = {doc_id: len(doc.pending) for doc_id, doc in enumerate(documents)}
+        start_time = last_report = time.monotonic()
+        # Tahap tulis diukur di koordinator; tahap lain dikirim worker per proses
+        metrics = PipelineMetrics()
+        worker_metrics = {}
+
+        def combined_metrics():
+            combined = PipelineMetrics()
+            combined.merge(metrics.state())
+            for state in worker_metrics.values():
+                combined.merge(state)
+            return combined
+
+        def report_commit(page_numbers):
+            nonlocal done_pages
+            for _ in page_numbers:
+                done_pages += 1
+                queue.put(("PROGRESS", done_pages))
+
+        def report(prefix):
+            minutes = max(time.monotonic() - start_time, 1e-6) / 60
+            queue.put(("LOG", f"{prefix} {done_pages}/{total_pending} halaman, {done_pages / minutes:.1f} halaman/menit"))
+
+        while True:
+            # Antrean tugas dibatasi agar tugas tetap bisa dibatalkan saat berhenti
+            while not tasks_exhausted and not stop_signal.is_set() and in_flight < num_workers * 2:
+                task = next(tasks, None)
+                if task is None:
+                    tasks_exhausted = True
+                    break
+                task_queue.put(task)
+                in_flight += 1
+            if in_flight == 0 and (tasks_exhausted or stop_signal.is_set()):
+                break
+
+            try:
+                msg = result_queue.get(timeout=1.0)
+            except Empty:
+                dead = [w for w in workers if not w.is_alive()]
+                if dead:
+                    raise RuntimeError(f"{len(dead)} worker batch berhenti tak terduga")
+                continue
+
+            msg_type = msg[0]
+            if msg_type == "READY":
+                queue.put(("LOG", f"Worker batch #{msg[1]} siap ({msg[2]})."))
+            elif msg_type == "PAGE":
+                _, doc_id, page_num, tables = msg
+                doc = documents[doc_id]
+                start = time.perf_counter()
+                report_commit(doc.writer.add_page(page_num, tables))
+                metrics.observe("write", time.perf_counter() - start, pages=1)
+                remaining[doc_id] -= 1
+                if remaining[doc_id] == 0:
+                    report_commit(doc.writer.close())
+                    queue.put(("LOG", f">>> Dokumen selesai: {os.path.basename(doc.pdf_path)} -> {doc.output_csv}"))
+            elif msg_type == "PAGE_ERROR":
+                _, doc_id, page_num, error = msg
+                remaining[doc_id] -= 1
+                queue.put(("LOG", f"!!! {os.path.basename(documents[doc_id].pdf_path)} halaman {page_num}: {error}"))
+                queue.put(("PAGE_FAILED", {"pdf": documents[doc_id].pdf_path, "page": page_num, "error": error}))
+            elif msg_type == "TASK_DONE":
+                in_flight -= 1
+            elif msg_type == "METRICS":
+                _, worker_id, pid, state = msg
+                worker_metrics[(worker_id, pid)] = state
+            elif msg_type == "MEMORY":
+                queue.put(("LOG", f"[MEMORI] Worker batch #{msg[1]}: {msg[2]}"))
+            elif msg_type == "WORKER_RESTART":
+                _, worker_id, reason = msg
+                queue.put(("LOG", f"[MEMORI] Worker batch #{worker_id}: {reason}, memulai ulang worker..."))
+                workers[worker_id].join(timeout=30)
+                if workers[worker_id].is_alive():
+                    workers[worker_id].terminate()
+                workers[worker_id] = start_page_worker(worker_id)
+            elif msg_type == "WORKER_ERROR":
+                raise RuntimeError(f"Worker batch #{msg[1]}: {msg[2]}")
+
+            if time.monotonic() - last_report >= BATCH_REPORT_INTERVAL:
+                report("[BATCH]")
+                if metrics_export:
+                    combined_metrics().save(os.path.join(output_dir, "batch"))
+                last_report = time.monotonic()
+
+        for doc in documents:
+            report_commit(doc.writer.close())
+        report("[BATCH] Ringkasan:")
+        combined = combined_metrics()
+        queue.put(("LOG", f"[METRIK] {combined.report()}"))
+        if metrics_export:
+            combined.save(os.path.join(output_dir, "batch"))
+        if stop_signal.is_set():
+            queue.put(("LOG", "Sinyal berhenti diterima. Halaman yang belum selesai tetap tertunda."))
+        queue.put(("DONE", "Proses batch selesai."))
+    except Exception as e:
+        queue.put(("ERROR", f"Error di batch: {e}"))
+    finally:
+        for _ in workers:
+            task_queue.put(None)
+        for worker in workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
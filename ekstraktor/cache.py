@@ -0,0 +1,142 @@
+"""Cache hasil per halaman yang dikunci dengan hash konten PDF atau gambar halaman."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .models import (
+    DETECTION_MODEL_NAME, STRUCTURE_MODEL_NAME, DETECTION_THRESHOLD, STRUCTURE_THRESHOLD,
+    DETECTION_BACKEND, STRUCTURE_BACKEND
+)
+from .ocr import OCR_CELL_CONFIG, OCR_TABLE_CONFIG
+from .textlayer import TEXT_LAYER_MODE
+
+# ===================================================================
+# CACHE HASIL PER HALAMAN (BERBASIS HASH KONTEN)
+# ===================================================================
+RESULT_CACHE_PATH = os.path.join("cache_ekstraksi", "hasil.sqlite3")
+RESULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def image_sha256(image):
+    digest = hashlib.sha256(f"{image.mode}:{image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+def result_cache_settings(dpi, ocr_mode, detection_backend=DETECTION_BACKEND, structure_backend=STRUCTURE_BACKEND,
+                          text_layer=TEXT_LAYER_MODE):
+    """Semua pengaturan yang memengaruhi hasil; perubahan salah satunya membuat kunci baru."""
+    settings = {
+        "dpi": dpi,
+        "detection_model": DETECTION_MODEL_NAME,
+        "structure_model": STRUCTURE_MODEL_NAME,
+        "detection_threshold": DETECTION_THRESHOLD,
+        "structure_threshold": STRUCTURE_THRESHOLD,
+        "ocr_mode": ocr_mode,
+        "ocr_cell_config": OCR_CELL_CONFIG,
+        "ocr_table_config": OCR_TABLE_CONFIG,
+    }
+    # Backend selain 'torch' bisa menghasilkan kotak sedikit berbeda. Hanya dicantumkan
+    # jika dipakai, agar kunci cache yang sudah ada untuk backend 'torch' tetap berlaku.
+    if detection_backend != "torch":
+        settings["detection_backend"] = detection_backend
+    if structure_backend != "torch":
+        settings["structure_backend"] = structure_backend
+    # Halaman digital diisi dari lapisan teks PDF, bukan OCR; 'off' = kunci lama
+    if text_layer != "off":
+        settings["text_layer"] = text_layer
+    return settings
+
+def page_cache_key(content_hash, page_index, settings):
+    payload = json.dumps([content_hash, page_index, settings], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class ResultCache:
+    """Cache persisten (SQLite) berisi kotak deteksi, kotak struktur, dan teks OCR per halaman.
+
+    Entri yang paling lama tidak diakses dihapus saat total ukuran melebihi `max_bytes`.
+    Aman dipakai dari beberapa thread pipeline sekaligus, dan dari beberapa proses (worker
+    batch) yang berbagi file yang sama: total ukuran selalu dibaca ulang dari database di
+    dalam transaksi tulis, bukan dihitung per proses.
+    """
+    def __init__(self, path=RESULT_CACHE_PATH, max_bytes=RESULT_CACHE_MAX_BYTES):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access)")
+        # Indeks penutup agar SUM(size) tidak perlu membaca kolom value
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_size ON entries(size)")
+        self._conn.commit()
+
+    def _total_bytes(self):
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key, record_miss=True):
+        """Mengambil nilai untuk `key`; record_miss=False untuk pencarian awal yang masih punya kunci cadangan."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                if record_miss:
+                    self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, keys, value):
+        """Menyimpan `value` di bawah satu atau beberapa kunci."""
+        blob = json.dumps(value).encode()
+        with self._lock:
+            # IMMEDIATE mengambil kunci tulis sejak awal, jadi proses lain tidak bisa
+            # menambah entri di antara membaca total ukuran dan menghapus entri lama
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key in keys:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                        (key, blob, len(blob), time.time())
+                    )
+                self._evict()
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    def _evict(self):
+        total = self._total_bytes()
+        while total > self.max_bytes:
+            rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_access LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            total = self._total_bytes()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": total}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,137 @@
+"""Entry point baris perintah: `python -m ekstraktor dokumen.pdf -o hasil.csv`.
+
+Modul berat baru diimpor setelah argumen diparse, sehingga `--help` tetap cepat.
+Ringkasan JSON ditulis ke stdout, log proses ke stderr.
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+
+from .models import MODEL_BACKENDS
+from .textlayer import TEXT_LAYER_MODES
+from .writers import SUPPORTED_FORMATS
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_INCOMPLETE = 3
+EXIT_STOPPED = 130
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="ekstraktor",
+        description="Ekstraktor Tabel PDF Cerdas tanpa GUI. Satu PDF diekstrak ke satu CSV; "
+                    "beberapa PDF atau sebuah folder diproses dalam mode batch.",
+    )
+    parser.add_argument("inputs", nargs="+", help="File PDF atau folder berisi PDF")
+    parser.add_argument("-o", "--output", help="File CSV output untuk satu dokumen (default: <nama>_hasil.csv)")
+    parser.add_argument("--output-dir", default="hasil_ekstraksi", help="Folder output mode batch (default: %(default)s)")
+    parser.add_argument("--start-page", type=int, help="Hanya proses halaman tertunda mulai halaman ini (default: semua halaman tertunda)")
+    parser.add_argument("--workers", type=int, help="Jumlah worker mode batch")
+    parser.add_argument("--ocr-mode", choices=["batch", "cell"], help="OCR satu kali per tabel atau per sel")
+    parser.add_argument("--ocr-workers", type=int, help="Jumlah worker OCR paralel (mode satu dokumen)")
+    parser.add_argument("--batch-size", type=int, help="Jumlah gambar per forward pass model")
+    parser.add_argument("--dpi", type=int, help="Resolusi rasterisasi halaman")
+    parser.add_argument("--format", default="csv", help="Format output, dipisah koma: csv, parquet (default: %(default)s)")
+    parser.add_argument("--commit-every", type=int, help="Jumlah halaman per commit ke output")
+    parser.add_argument("--detection-backend", choices=MODEL_BACKENDS, help="Backend model deteksi (default: torch)")
+    parser.add_argument("--structure-backend", choices=MODEL_BACKENDS, help="Backend model struktur (default: torch)")
+    parser.add_argument("--model-dir", help="Folder salinan lokal model (default: folder cache pengguna atau EKSTRAKTOR_MODEL_DIR)")
+    parser.add_argument("--offline", action="store_true", help="Jangan mengunduh model; muat hanya dari folder/cache lokal")
+    parser.add_argument("--text-layer", choices=TEXT_LAYER_MODES,
+                        help="Lapisan teks PDF digital: off = selalu OCR, cells = isi sel dari teks PDF, "
+                             "full = juga simpulkan baris/kolom dari teks (default: cells)")
+    parser.add_argument("--memory-limit", type=int, metavar="MB", help="Batas RSS per worker dalam MB (default: otomatis)")
+    parser.add_argument("--cache", help="Path cache hasil SQLite")
+    parser.add_argument("--no-cache", action="store_true", help="Nonaktifkan cache hasil")
+    parser.add_argument("--no-metrics", action="store_true", help="Jangan simpan file metrik <output>.metrics.json/.prom")
+    parser.add_argument("--summary", metavar="PATH", help="Simpan juga ringkasan JSON ke file ini")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Hanya tampilkan log error")
+    return parser
+
+def _options(args, batch):
+    options = {
+        "ocr_mode": args.ocr_mode,
+        "batch_size": args.batch_size,
+        "dpi": args.dpi,
+        "result_cache_path": args.cache,
+        "output_formats": args.output_formats,
+        "commit_every": args.commit_every,
+        "memory_limit_mb": args.memory_limit,
+        "detection_backend": args.detection_backend,
+        "structure_backend": args.structure_backend,
+        "model_dir": args.model_dir,
+        "text_layer": args.text_layer,
+    }
+    if batch:
+        options["num_workers"] = args.workers
+    else:
+        options["ocr_workers"] = args.ocr_workers
+    options = {key: value for key, value in options.items() if value is not None}
+    if args.no_cache:
+        options["result_cache_path"] = None
+    if args.offline:
+        options["model_offline"] = True
+    if args.no_metrics:
+        options["metrics_export"] = False
+    return options
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    formats = [fmt.strip().lower() for fmt in args.format.split(",") if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in SUPPORTED_FORMATS]
+    if unknown or not formats:
+        parser.error(f"format output tidak dikenal: {', '.join(unknown) or args.format!r}")
+    args.output_formats = tuple(formats)
+    batch = len(args.inputs) > 1 or os.path.isdir(args.inputs[0])
+
+    def on_message(msg_type, message):
+        if msg_type == "ERROR" or (msg_type == "LOG" and not args.quiet):
+            print(str(message).strip("\n"), file=sys.stderr, flush=True)
+
+    try:
+        from .api import extract_pdf, run_batch
+    except ImportError as e:
+        print(json.dumps({"status": "error", "error": f"Dependensi tidak tersedia: {e}"}), flush=True)
+        return EXIT_ERROR
+
+    if batch:
+        import multiprocessing
+        stop_signal = multiprocessing.Event()
+    else:
+        import threading
+        stop_signal = threading.Event()
+
+    def request_stop(signum, frame):
+        # Ctrl+C pertama: berhenti rapi di batas halaman; berikutnya: keluar paksa
+        print(">>> Sinyal berhenti diterima, menyelesaikan halaman berjalan...", file=sys.stderr, flush=True)
+        stop_signal.set()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    signal.signal(signal.SIGINT, request_stop)
+    if batch:
+        summary = run_batch(args.inputs, args.output_dir, stop_signal=stop_signal,
+                            on_message=on_message, **_options(args, batch))
+    else:
+        summary = extract_pdf(args.inputs[0], args.output, start_page=args.start_page, stop_signal=stop_signal,
+                              on_message=on_message, **_options(args, batch))
+
+    text = json.dumps(summary, ensure_ascii=False)
+    print(text, flush=True)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    if summary["status"] == "error":
+        return EXIT_ERROR
+    if summary["status"] == "stopped":
+        return EXIT_STOPPED
+    if summary["status"] == "incomplete":
+        return EXIT_INCOMPLETE
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Pengelolaan memori worker: RSS worker sendiri diukur dan ditangani secara bertahap."""
+import ctypes
+import gc
+import sys
+
+import psutil
+
+# ===================================================================
+# PENGELOLAAN MEMORI WORKER
+# ===================================================================
+# Batas RSS per worker dalam MB, termasuk proses anak (pool OCR, Tesseract); 0 = otomatis
+WORKER_MEMORY_LIMIT_MB = 0
+# Batas otomatis: porsi RAM fisik yang dibagi rata ke semua worker
+WORKER_MEMORY_AUTO_FRACTION = 0.6
+# Ambang bertahap sebagai porsi batas: perkecil jendela -> lepas cache -> restart
+MEMORY_SHRINK_AT = 0.70
+MEMORY_RELEASE_AT = 0.85
+
+MEMORY_OK, MEMORY_SHRINK, MEMORY_RELEASE, MEMORY_RESTART = range(4)
+
+def worker_memory_limit(limit_mb=WORKER_MEMORY_LIMIT_MB, workers=1):
+    """Batas RSS satu worker dalam byte."""
+    if limit_mb and limit_mb > 0:
+        return int(limit_mb * 1024 * 1024)
+    return int(psutil.virtual_memory().total * WORKER_MEMORY_AUTO_FRACTION / max(1, workers))
+
+def process_rss(pid=None, include_children=True):
+    """RSS sebuah proses (default: proses ini) ditambah seluruh proses anaknya, dalam byte."""
+    process = psutil.Process(pid)
+    processes = [process]
+    if include_children:
+        processes += process.children(recursive=True)
+    total = 0
+    for proc in processes:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            # Proses anak (mis. Tesseract) bisa selesai di tengah pengukuran
+            continue
+    return total
+
+def release_memory(models=None):
+    """Melepas memori yang bisa dilepas tanpa menghentikan worker."""
+    gc.collect()
+    if models is not None:
+        models.release_cache()
+    if sys.platform.startswith("linux"):
+        # Kembalikan heap glibc yang sudah bebas ke sistem operasi
+        try:
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+class MemoryGovernor:
+    """Menjaga RSS worker di bawah `limit_bytes` dengan langkah bertahap.
+
+    check() dipanggil di batas halaman. Di atas MEMORY_SHRINK_AT ukuran batch inferensi,
+    batch tahap pipeline, dan jendela OCR dibagi dua; di atas MEMORY_RELEASE_AT cache
+    dilepas (gc, cache CUDA, malloc_trim). Jika RSS tetap di atas batas, check()
+    mengembalikan MEMORY_RESTART dan pemanggil menghentikan worker secara rapi.
+    """
+    def __init__(self, limit_bytes, models=None, ocr_pool=None, stages=()):
+        self.limit_bytes = limit_bytes
+        self.models = models
+        self.ocr_pool = ocr_pool
+        self.stages = [stage for stage in stages if stage.batch_size is not None]
+        self.peak_rss = 0
+
+    def shrink(self):
+        """Membagi dua semua jendela; False jika semuanya sudah minimal."""
+        changed = False
+        if self.models is not None and self.models.batch_size > 1:
+            self.models.batch_size //= 2
+            changed = True
+        for stage in self.stages:
+            if stage.batch_size > 1:
+                stage.batch_size //= 2
+                changed = True
+        if self.ocr_pool is not None and self.ocr_pool.max_in_flight > self.ocr_pool.workers:
+            self.ocr_pool.max_in_flight = max(self.ocr_pool.workers, self.ocr_pool.max_in_flight // 2)
+            changed = True
+        return changed
+
+    def check(self):
+        """Mengukur RSS dan menjalankan langkah yang sesuai; mengembalikan (aksi, rss)."""
+        rss = process_rss()
+        self.peak_rss = max(self.peak_rss, rss)
+        action = MEMORY_OK
+        if rss >= self.limit_bytes * MEMORY_SHRINK_AT and self.shrink():
+            action = MEMORY_SHRINK
+        if rss >= self.limit_bytes * MEMORY_RELEASE_AT:
+            release_memory(self.models)
+            action = MEMORY_RELEASE
+            rss = process_rss()
+        if rss >= self.limit_bytes:
+            action = MEMORY_RESTART
+        return action, rss
+
+    def describe(self):
+        parts = []
+        if self.models is not None:
+            parts.append(f"batch inferensi {self.models.batch_size}")
+        if self.ocr_pool is not None:
+            parts.append(f"jendela OCR {self.ocr_pool.max_in_flight}")
+        return ", ".join(parts)
@@ -0,0 +1,180 @@
+"""Metrik per tahap pipeline: histogram durasi, penghitung, dan ekspor JSON / teks Prometheus."""
+import json
+import os
+import threading
+import time
+
+# ===================================================================
+# METRIK PIPELINE
+# ===================================================================
+# Batas atas bucket histogram durasi (detik)
+METRIC_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Tahap dan satuan yang diukur. Tahap yang berjalan per batch (deteksi, struktur, OCR)
+# dicatat sebagai waktu batch dibagi rata ke halaman, tabel, atau sel di dalamnya.
+STAGE_UNITS = {
+    "rasterize": ("page",),
+    "detection": ("page",),
+    "structure": ("page", "table"),
+    "ocr": ("page", "table", "cell"),
+    "write": ("page",),
+}
+COUNTERS = ("pages", "pages_text_layer", "pages_cached", "tables", "cells")
+# True = simpan metrik di samping output (<output>.metrics.json dan <output>.metrics.prom)
+METRICS_EXPORT = True
+
+class Histogram:
+    """Histogram kumulatif berbucket tetap, seperti histogram Prometheus."""
+    def __init__(self, buckets=METRIC_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value, times=1):
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self.counts[index] += times
+        self.count += times
+        self.sum += value * times
+        self.max = max(self.max, value)
+
+    def merge(self, state):
+        for i, count in enumerate(state["counts"]):
+            self.counts[i] += count
+        self.count += state["count"]
+        self.sum += state["sum"]
+        self.max = max(self.max, state["max"])
+
+    def quantile(self, q):
+        """Perkiraan kuantil dengan interpolasi linear di dalam bucket (seperti histogram_quantile)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def state(self):
+        return {"counts": list(self.counts), "count": self.count, "sum": self.sum, "max": self.max}
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "max": round(self.max, 6),
+        }
+
+class PipelineMetrics:
+    """Histogram durasi per (tahap, satuan) dan penghitung halaman/tabel/sel.
+
+    Aman dipanggil dari beberapa thread tahap pipeline. state() menghasilkan dict
+    biasa yang bisa dikirim antar proses dan digabung kembali dengan merge(). Waktu
+    memuat model dicatat terpisah (model_load_seconds, dijumlah antar worker) karena
+    hanya terjadi sekali per worker, bukan per halaman.
+    """
+    def __init__(self):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.histograms = {(stage, unit): Histogram() for stage, units in STAGE_UNITS.items() for unit in units}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.model_load_seconds = 0.0
+
+    def observe(self, stage, seconds, pages=0, tables=0, cells=0):
+        """Mencatat satu pengukuran tahap dan membaginya rata ke halaman/tabel/sel yang dicakup."""
+        with self._lock:
+            for unit, count in (("page", pages), ("table", tables), ("cell", cells)):
+                if count and (stage, unit) in self.histograms:
+                    self.histograms[(stage, unit)].observe(seconds / count, times=count)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def observe_model_load(self, seconds):
+        with self._lock:
+            self.model_load_seconds += seconds
+
+    def state(self):
+        with self._lock:
+            return {
+                "started": self.started,
+                "histograms": {f"{stage}/{unit}": h.state() for (stage, unit), h in self.histograms.items()},
+                "counters": dict(self.counters),
+                "model_load_seconds": self.model_load_seconds,
+            }
+
+    def merge(self, state):
+        with self._lock:
+            self.started = min(self.started, state["started"])
+            for key, hist_state in state["histograms"].items():
+                self.histograms[tuple(key.split("/"))].merge(hist_state)
+            for name, value in state["counters"].items():
+                self.counters[name] += value
+            self.model_load_seconds += state.get("model_load_seconds", 0.0)
+
+    def to_dict(self):
+        with self._lock:
+            elapsed = max(time.time() - self.started, 1e-9)
+            stages = {}
+            for (stage, unit), hist in self.histograms.items():
+                stages.setdefault(stage, {})[unit] = hist.summary()
+            return {
+                "elapsed_seconds": round(elapsed, 3),
+                "model_load_seconds": round(self.model_load_seconds, 3),
+                "counters": dict(self.counters),
+                "throughput": {
+                    "pages_per_second": round(self.counters["pages"] / elapsed, 4),
+                    "cells_per_second": round(self.counters["cells"] / elapsed, 4),
+                },
+                "stages": stages,
+            }
+
+    def to_prometheus(self, prefix="ekstraktor"):
+        """Format eksposisi teks Prometheus (histogram, counter, dan gauge throughput)."""
+        data = self.to_dict()
+        lines = [f"# HELP {prefix}_stage_seconds Durasi tahap pipeline per halaman, tabel, atau sel.",
+                 f"# TYPE {prefix}_stage_seconds histogram"]
+        with self._lock:
+            for (stage, unit), hist in self.histograms.items():
+                labels = f'stage="{stage}",unit="{unit}"'
+                cumulative = 0
+                bounds = [f"{bound:g}" for bound in hist.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, hist.counts):
+                    cumulative += count
+                    lines.append(f'{prefix}_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {hist.sum:.6f}")
+                lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {hist.count}")
+        for name, value in data["counters"].items():
+            lines += [f"# TYPE {prefix}_{name}_total counter", f"{prefix}_{name}_total {value}"]
+        for name, value in data["throughput"].items():
+            lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {value}"]
+        lines += [f"# TYPE {prefix}_model_load_seconds gauge", f"{prefix}_model_load_seconds {data['model_load_seconds']}"]
+        return "\n".join(lines) + "\n"
+
+    def save(self, path):
+        """Menulis `<path>.metrics.json` dan `<path>.metrics.prom` secara atomik."""
+        for suffix, text in ((".metrics.json", json.dumps(self.to_dict(), indent=2)),
+                             (".metrics.prom", self.to_prometheus())):
+            tmp_path = path + suffix + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path + suffix)
+
+    def report(self):
+        """Ringkasan satu baris untuk log."""
+        data = self.to_dict()
+        parts = [f"{data['throughput']['pages_per_second'] * 60:.1f} hlm/menit",
+                 f"{data['throughput']['cells_per_second']:.1f} sel/detik"]
+        for stage, units in data["stages"].items():
+            unit = "cell" if stage == "ocr" else "page"
+            summary = units[unit]
+            if summary["count"]:
+                parts.append(f"{stage}/{unit} p50 {summary['p50'] * 1000:.0f}ms p95 {summary['p95'] * 1000:.0f}ms")
+        return ", ".join(parts)
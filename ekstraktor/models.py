@@ -0,0 +1,236 @@
+"""Model Table Transformer untuk deteksi tabel dan pengenalan struktur."""
+import os
+import shutil
+import threading
+from types import SimpleNamespace
+
+# ===================================================================
+# MODEL TABLE TRANSFORMER
+# ===================================================================
+DETECTION_MODEL_NAME = "microsoft/table-transformer-detection"
+STRUCTURE_MODEL_NAME = "microsoft/table-transformer-structure-recognition"
+DETECTION_THRESHOLD = 0.85
+STRUCTURE_THRESHOLD = 0.7
+# Jumlah halaman (deteksi) atau potongan tabel (struktur) per forward pass
+INFERENCE_BATCH_SIZE = 4
+def _user_cache_dir():
+    """Folder cache per pengguna: %LOCALAPPDATA% di Windows, $XDG_CACHE_HOME atau ~/.cache di tempat lain."""
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        return os.path.join(os.environ["LOCALAPPDATA"], "ekstraktor")
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "ekstraktor")
+
+# Salinan lokal model (safetensors) agar worker yang di-restart memuat ulang lewat mmap
+# dari page cache, tanpa akses jaringan; None = selalu muat dari cache Hugging Face.
+# Disimpan di folder cache pengguna (bukan folder kerja) dan bisa diganti lewat EKSTRAKTOR_MODEL_DIR.
+MODEL_SNAPSHOT_DIR = os.environ.get("EKSTRAKTOR_MODEL_DIR") or os.path.join(_user_cache_dir(), "models")
+# True = jangan pernah menghubungi Hugging Face Hub; model harus sudah ada di
+# MODEL_SNAPSHOT_DIR (bisa disalin dari komputer lain) atau di cache Hugging Face
+MODEL_OFFLINE = False
+
+# Backend per model:
+#   'torch' = PyTorch fp32, di GPU jika tersedia (perilaku awal)
+#   'int8'  = kuantisasi dinamis int8 untuk lapisan Linear, khusus CPU
+#   'onnx'  = diekspor sekali ke ONNX di folder salinan, dijalankan ONNX Runtime (CPU)
+MODEL_BACKENDS = ("torch", "int8", "onnx")
+DETECTION_BACKEND = "torch"
+STRUCTURE_BACKEND = "torch"
+ONNX_OPSET = 17
+
+def _onnx_export_module(model):
+    """Membungkus model agar torch.onnx.export menghasilkan dua output bernama."""
+    import torch
+
+    class DetectionOutputs(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, pixel_values, pixel_mask):
+            outputs = self.model(pixel_values=pixel_values, pixel_mask=pixel_mask)
+            return outputs.logits, outputs.pred_boxes
+
+    return DetectionOutputs().eval()
+
+class ModelRunner:
+    """Processor, fungsi forward, dan device input untuk satu model dengan satu backend."""
+    def __init__(self, processor, forward, device, id2label, backend):
+        self.processor = processor
+        self.forward = forward
+        self.device = device
+        self.id2label = id2label
+        self.backend = backend
+
+class TableModels:
+    """Model deteksi tabel dan pengenalan struktur beserta processor-nya.
+
+    Kedua metode menerima list gambar dan menjalankannya dalam satu forward pass per
+    batch, lalu memecah hasil post_process_object_detection kembali per gambar.
+    torch dan transformers baru diimpor dan model baru dimuat saat pertama kali
+    dibutuhkan, sehingga proses yang seluruh halamannya ada di cache tetap ringan.
+    Pemuatan pertama menyimpan salinan safetensors di `snapshot_dir`; pemuatan
+    berikutnya (termasuk worker yang di-restart) membaca salinan itu. Backend setiap
+    model dipilih terpisah (lihat MODEL_BACKENDS).
+    """
+    def __init__(self, batch_size=INFERENCE_BATCH_SIZE, snapshot_dir=MODEL_SNAPSHOT_DIR,
+                 detection_backend=DETECTION_BACKEND, structure_backend=STRUCTURE_BACKEND,
+                 offline=MODEL_OFFLINE, device=None):
+        for backend in (detection_backend, structure_backend):
+            if backend not in MODEL_BACKENDS:
+                raise ValueError(f"Backend model tidak dikenal: {backend}")
+        if "onnx" in (detection_backend, structure_backend) and not snapshot_dir:
+            raise ValueError("Backend 'onnx' membutuhkan snapshot_dir untuk menyimpan hasil ekspor")
+        self.batch_size = max(1, batch_size)
+        self.snapshot_dir = snapshot_dir
+        self.detection_backend = detection_backend
+        self.structure_backend = structure_backend
+        self.offline = offline
+        # None = GPU jika tersedia; bisa dipaksa mis. "cpu"
+        self._requested_device = device
+        self.device = None
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def load(self):
+        # Tahap deteksi dan struktur berjalan di thread berbeda; muat sekali saja
+        with self._lock:
+            if self._loaded:
+                return
+            import torch
+
+            self._torch = torch
+            # Gunakan GPU jika tersedia
+            self.device = torch.device(self._requested_device or ("cuda" if torch.cuda.is_available() else "cpu"))
+            self.detection = self._load_runner(DETECTION_MODEL_NAME, self.detection_backend)
+            self.structure = self._load_runner(STRUCTURE_MODEL_NAME, self.structure_backend)
+            self._loaded = True
+
+    def describe(self):
+        if not self._loaded:
+            return "belum dimuat"
+        return (f"deteksi {self.detection.backend}@{self.detection.device}, "
+                f"struktur {self.structure.backend}@{self.structure.device}")
+
+    def _snapshot_path(self, name):
+        return os.path.join(self.snapshot_dir, name.replace("/", "--")) if self.snapshot_dir else None
+
+    def _load_pretrained(self, name):
+        from transformers import AutoImageProcessor, AutoModelForObjectDetection
+
+        snapshot = self._snapshot_path(name)
+        if snapshot and os.path.exists(os.path.join(snapshot, "config.json")):
+            processor = AutoImageProcessor.from_pretrained(snapshot)
+            model = AutoModelForObjectDetection.from_pretrained(snapshot)
+            return processor, model
+        processor = AutoImageProcessor.from_pretrained(name, local_files_only=self.offline)
+        model = AutoModelForObjectDetection.from_pretrained(name, local_files_only=self.offline)
+        if snapshot:
+            # Bobot backbone sudah ada di checkpoint; jangan unduh ulang saat memuat salinan
+            model.config.use_pretrained_backbone = False
+            tmp_dir = f"{snapshot}.tmp{os.getpid()}"
+            processor.save_pretrained(tmp_dir)
+            model.save_pretrained(tmp_dir, safe_serialization=True)
+            try:
+                os.replace(tmp_dir, snapshot)
+            except OSError:
+                # Worker lain sudah lebih dulu menyimpan salinannya
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        return processor, model
+
+    def _load_runner(self, name, backend):
+        torch = self._torch
+        processor, model = self._load_pretrained(name)
+        model.eval()
+        id2label = model.config.id2label
+        if backend == "torch":
+            model = model.to(self.device)
+            return ModelRunner(processor, lambda inputs: model(**inputs), self.device, id2label, backend)
+
+        cpu = torch.device("cpu")
+        if backend == "int8":
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            return ModelRunner(processor, lambda inputs: model(**inputs), cpu, id2label, backend)
+
+        import onnxruntime
+
+        onnx_path = os.path.join(self._snapshot_path(name), "model.onnx")
+        if not os.path.exists(onnx_path):
+            self._export_onnx(processor, model, onnx_path)
+        session = onnxruntime.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+
+        def forward(inputs):
+            logits, pred_boxes = session.run(["logits", "pred_boxes"], {
+                "pixel_values": inputs["pixel_values"].numpy(),
+                "pixel_mask": inputs["pixel_mask"].numpy(),
+            })
+            # post_process_object_detection hanya membaca logits dan pred_boxes
+            return SimpleNamespace(logits=torch.from_numpy(logits), pred_boxes=torch.from_numpy(pred_boxes))
+
+        return ModelRunner(processor, forward, cpu, id2label, backend)
+
+    def _export_onnx(self, processor, model, onnx_path):
+        from PIL import Image
+
+        torch = self._torch
+        # Contoh input hanya menentukan graf; batch, tinggi, dan lebar dibuat dinamis
+        sample = processor(images=[Image.new("RGB", (800, 600), "white")], return_tensors="pt")
+        os.makedirs(os.path.dirname(onnx_path), exist_ok=True)
+        tmp_path = f"{onnx_path}.tmp{os.getpid()}"
+        with torch.no_grad():
+            torch.onnx.export(
+                _onnx_export_module(model), (sample["pixel_values"], sample["pixel_mask"]), tmp_path,
+                input_names=["pixel_values", "pixel_mask"], output_names=["logits", "pred_boxes"],
+                dynamic_axes={
+                    "pixel_values": {0: "batch", 2: "height", 3: "width"},
+                    "pixel_mask": {0: "batch", 1: "height", 2: "width"},
+                    "logits": {0: "batch"},
+                    "pred_boxes": {0: "batch"},
+                },
+                opset_version=ONNX_OPSET,
+            )
+        os.replace(tmp_path, onnx_path)
+
+    def release_cache(self):
+        """Melepas blok memori GPU yang di-cache allocator PyTorch."""
+        if self._loaded and self.device.type == "cuda":
+            self._torch.cuda.empty_cache()
+
+    def _predict(self, runner, images, threshold):
+        torch = self._torch
+        results = []
+        for start in range(0, len(images), self.batch_size):
+            batch = images[start:start + self.batch_size]
+            # inference_mode: tanpa pencatatan autograd, lebih hemat memori dan waktu
+            with torch.inference_mode():
+                inputs = runner.processor(images=batch, return_tensors="pt").to(runner.device)
+                outputs = runner.forward(inputs)
+                target_sizes = torch.tensor([image.size[::-1] for image in batch])
+                batch_results = runner.processor.post_process_object_detection(outputs, target_sizes=target_sizes, threshold=threshold)
+            for result in batch_results:
+                labeled = [(runner.id2label[label.item()], box.tolist()) for label, box in zip(result["labels"], result["boxes"])]
+                results.append(labeled)
+        return results
+
+    def detect_tables(self, images):
+        """Mengembalikan daftar bounding box tabel untuk setiap halaman."""
+        if not images:
+            return []
+        self.load()
+        predictions = self._predict(self.detection, images, DETECTION_THRESHOLD)
+        return [[box for label, box in labeled if label == 'table'] for labeled in predictions]
+
+    def recognize_structure(self, table_images):
+        """Mengembalikan (row_boxes, column_boxes) terurut untuk setiap potongan tabel."""
+        if not table_images:
+            return []
+        self.load()
+        predictions = self._predict(self.structure, table_images, STRUCTURE_THRESHOLD)
+        structures = []
+        for labeled in predictions:
+            row_boxes = sorted((box for label, box in labeled if label == 'table row'), key=lambda x: x[1])
+            column_boxes = sorted((box for label, box in labeled if label == 'table column'), key=lambda x: x[0])
+            structures.append((row_boxes, column_boxes))
+        return structures
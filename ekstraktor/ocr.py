@@ -0,0 +1,257 @@
+"""OCR sel tabel dengan Tesseract: per sel, per tabel (batch), dan pool paralel."""
+import os
+import signal
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+import pytesseract
+
+# ===================================================================
+# KONFIGURASI OCR
+# ===================================================================
+OCR_LANG = 'eng+ind'
+# Mode OCR: 'batch' = satu panggilan Tesseract per tabel, 'cell' = satu per sel
+OCR_MODE = 'batch'
+OCR_CELL_CONFIG = f'--psm 7 -l {OCR_LANG}'
+# PSM 11 (sparse text) cocok untuk tabel: kata dicari di seluruh area tanpa asumsi paragraf
+OCR_TABLE_CONFIG = f'--psm 11 -l {OCR_LANG}'
+# Kata dengan confidence di bawah ini membuat selnya di-OCR ulang secara terpisah
+OCR_MIN_CONFIDENCE = 60
+# Porsi minimal luas kata yang harus berada di dalam satu sel agar dianggap tidak ambigu
+OCR_MIN_WORD_OVERLAP = 0.6
+# Pool OCR: 'thread' (thread memanggil subprocess Tesseract) atau 'process'
+OCR_EXECUTOR = 'thread'
+OCR_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+# Jumlah baris tabel per tugas OCR dan batas potongan gambar yang boleh antre sekaligus
+OCR_ROWS_PER_TASK = 8
+OCR_MAX_IN_FLIGHT = OCR_WORKERS * 2
+# Thread OpenMP per proses Tesseract saat OCR berjalan di pool; tanpa batas ini setiap
+# Tesseract membuat tim thread sebanyak core dan pool justru berebut CPU
+OCR_POOL_TESSERACT_THREADS = 1
+
+# ===================================================================
+# FUNGSI BANTUAN OCR
+# ===================================================================
+def ignore_interrupts():
+    """Menjauhkan SIGINT (Ctrl+C) dari thread/proses ini dan proses anaknya (Tesseract, Poppler).
+
+    Ctrl+C dikirim ke seluruh process group; Tesseract yang ikut mati akan terbaca
+    sebagai sel kosong. Berhenti disampaikan lewat stop_signal, dan hanya thread utama
+    proses pemanggil yang menangani SIGINT. Di worker proses sinyal diabaikan; di
+    thread sinyal diblokir, dan mask tersebut diwarisi proses anak yang dibuatnya.
+    """
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    elif hasattr(signal, "pthread_sigmask"):
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT})
+
+def _init_pool_worker():
+    ignore_interrupts()
+    # Tesseract mewarisi environment proses saat dijalankan. Thread pool baru dibuat saat
+    # tugas OCR pertama, setelah model (dan runtime OpenMP-nya) dimuat, jadi batas ini
+    # tidak ikut membatasi inferensi. Nilai yang sudah diset pengguna dihormati.
+    os.environ.setdefault("OMP_THREAD_LIMIT", str(OCR_POOL_TESSERACT_THREADS))
+
+def get_cell_coordinates(row_boxes, column_boxes):
+    cells = []
+    for row_box in row_boxes:
+        row_cells = []
+        for col_box in column_boxes:
+            cell_box = [col_box[0], row_box[1], col_box[2], row_box[3]]
+            row_cells.append(cell_box)
+        cells.append(row_cells)
+    return cells
+
+def apply_ocr_to_cell(image, cell_coords):
+    cell_image = image.crop(cell_coords)
+    try:
+        # Optimasi OCR dengan bahasa Inggris dan Indonesia
+        text = pytesseract.image_to_string(cell_image, config=OCR_CELL_CONFIG).strip()
+    except Exception:
+        text = ""
+    return text
+
+def _words_from_ocr_data(data):
+    """Mengubah output image_to_data menjadi daftar kata beserta bounding box-nya."""
+    words = []
+    for i, text in enumerate(data['text']):
+        text = str(text).strip()
+        conf = float(data['conf'][i])
+        if not text or conf < 0:
+            continue
+        left, top = data['left'][i], data['top'][i]
+        words.append({
+            'text': text,
+            'conf': conf,
+            'box': [left, top, left + data['width'][i], top + data['height'][i]],
+        })
+    return words
+
+def _overlap_area(box_a, box_b):
+    width = min(box_a[2], box_b[2]) - max(box_a[0], box_b[0])
+    height = min(box_a[3], box_b[3]) - max(box_a[1], box_b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    return width * height
+
+def _join_words(words):
+    """Menyusun kata dalam satu sel menjadi teks: baris atas ke bawah, kiri ke kanan."""
+    lines = []
+    for word in sorted(words, key=lambda w: w['box'][1]):
+        center_y = (word['box'][1] + word['box'][3]) / 2
+        if lines and lines[-1]['top'] <= center_y <= lines[-1]['bottom']:
+            lines[-1]['words'].append(word)
+            lines[-1]['bottom'] = max(lines[-1]['bottom'], word['box'][3])
+        else:
+            lines.append({'top': word['box'][1], 'bottom': word['box'][3], 'words': [word]})
+    return " ".join(
+        " ".join(w['text'] for w in sorted(line['words'], key=lambda w: w['box'][0]))
+        for line in lines
+    )
+
+def assign_words_to_cells(words, cell_coordinates):
+    """Memetakan kata hasil OCR ke sel dari get_cell_coordinates.
+
+    Mengembalikan (table_data, ambiguous): grid teks per sel dan himpunan (baris, kolom)
+    yang perlu di-OCR ulang karena ada kata yang melintasi batas sel atau confidence rendah.
+    """
+    buckets = [[[] for _ in row] for row in cell_coordinates]
+    ambiguous = set()
+    for word in words:
+        box = word['box']
+        area = max((box[2] - box[0]) * (box[3] - box[1]), 1)
+        best_cell, best_overlap = None, 0.0
+        for r, row in enumerate(cell_coordinates):
+            # Semua sel dalam satu baris berbagi batas vertikal yang sama
+            if not row or row[0][3] <= box[1] or row[0][1] >= box[3]:
+                continue
+            for c, cell in enumerate(row):
+                overlap = _overlap_area(box, cell) / area
+                if overlap > best_overlap:
+                    best_cell, best_overlap = (r, c), overlap
+        if best_cell is None:
+            continue
+        buckets[best_cell[0]][best_cell[1]].append(word)
+        if best_overlap < OCR_MIN_WORD_OVERLAP or word['conf'] < OCR_MIN_CONFIDENCE:
+            ambiguous.add(best_cell)
+    table_data = [[_join_words(cell_words) for cell_words in row] for row in buckets]
+    return table_data, ambiguous
+
+def ocr_table_batched(table_image, cell_coordinates):
+    """OCR satu tabel dengan satu panggilan Tesseract, fallback per sel untuk sel ambigu.
+
+    Mengembalikan (table_data, jumlah sel yang di-OCR ulang).
+    """
+    try:
+        data = pytesseract.image_to_data(table_image, config=OCR_TABLE_CONFIG, output_type=pytesseract.Output.DICT)
+    except Exception:
+        table_data = [[apply_ocr_to_cell(table_image, cell) for cell in row] for row in cell_coordinates]
+        return table_data, sum(len(row) for row in cell_coordinates)
+    table_data, ambiguous = assign_words_to_cells(_words_from_ocr_data(data), cell_coordinates)
+    for r, c in ambiguous:
+        table_data[r][c] = apply_ocr_to_cell(table_image, cell_coordinates[r][c])
+    return table_data, len(ambiguous)
+
+def ocr_table(table_image, cell_coordinates, mode=OCR_MODE):
+    """Menjalankan OCR untuk seluruh sel tabel sesuai mode ('batch' atau 'cell')."""
+    if mode == 'batch':
+        return ocr_table_batched(table_image, cell_coordinates)
+    table_data = [[apply_ocr_to_cell(table_image, cell) for cell in row] for row in cell_coordinates]
+    return table_data, 0
+
+def _ocr_task(image, cell_coordinates, mode):
+    # Fungsi level modul agar bisa di-pickle oleh ProcessPoolExecutor
+    return ocr_table(image, cell_coordinates, mode=mode)
+
+class OcrExecutor:
+    """Pool OCR yang menyebar potongan baris tabel ke beberapa worker.
+
+    Hasil dikembalikan dalam urutan tabel, baris, dan kolom semula. Potongan gambar
+    dibuat secara lazy sehingga paling banyak `max_in_flight` potongan ada di memori.
+    """
+    def __init__(self, workers=OCR_WORKERS, kind=OCR_EXECUTOR, mode=OCR_MODE,
+                 rows_per_task=OCR_ROWS_PER_TASK, max_in_flight=OCR_MAX_IN_FLIGHT):
+        self.workers = max(1, workers)
+        self.mode = mode
+        self.rows_per_task = max(1, rows_per_task)
+        self.max_in_flight = max(1, max_in_flight)
+        self._pool = None
+        if self.workers > 1:
+            pool_class = ProcessPoolExecutor if kind == 'process' else ThreadPoolExecutor
+            self._pool = pool_class(max_workers=self.workers, initializer=_init_pool_worker)
+
+    def _split(self, tables):
+        """Memecah setiap tabel menjadi potongan beberapa baris dengan koordinat lokal."""
+        for table_idx, (table_image, cell_coordinates) in enumerate(tables):
+            for start in range(0, len(cell_coordinates), self.rows_per_task):
+                chunk = cell_coordinates[start:start + self.rows_per_task]
+                left = max(0, min(cell[0] for row in chunk for cell in row))
+                top = max(0, min(row[0][1] for row in chunk))
+                right = min(table_image.width, max(cell[2] for row in chunk for cell in row))
+                bottom = min(table_image.height, max(row[0][3] for row in chunk))
+                crop = table_image.crop((left, top, right, bottom))
+                local_cells = [[[cell[0] - left, cell[1] - top, cell[2] - left, cell[3] - top] for cell in row] for row in chunk]
+                yield table_idx, crop, local_cells
+
+    def _wait(self, future, stop_signal):
+        while True:
+            try:
+                return future.result(timeout=0.5)
+            except FutureTimeoutError:
+                if stop_signal is not None and stop_signal.is_set():
+                    return None
+
+    def ocr_tables(self, tables, stop_signal=None):
+        """OCR sekumpulan (table_image, cell_coordinates).
+
+        Mengembalikan list (table_data, fallback_cells) per tabel, atau None jika
+        stop_signal diset sebelum semua tugas selesai. Hasil yang selesai setelah sinyal
+        berhenti juga dibuang, karena Tesseract yang ikut terhenti menghasilkan sel kosong.
+        """
+        results = [([], 0) for _ in tables]
+        tasks = self._split(tables)
+        if self._pool is None:
+            for table_idx, crop, cells in tasks:
+                if stop_signal is not None and stop_signal.is_set():
+                    return None
+                table_data, fallback_cells = ocr_table(crop, cells, mode=self.mode)
+                results[table_idx] = (results[table_idx][0] + table_data, results[table_idx][1] + fallback_cells)
+            if stop_signal is not None and stop_signal.is_set():
+                return None
+            return results
+
+        pending = deque()
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < self.max_in_flight:
+                if stop_signal is not None and stop_signal.is_set():
+                    self._cancel(pending)
+                    return None
+                task = next(tasks, None)
+                if task is None:
+                    exhausted = True
+                    break
+                table_idx, crop, cells = task
+                pending.append((table_idx, self._pool.submit(_ocr_task, crop, cells, self.mode)))
+            if not pending:
+                if stop_signal is not None and stop_signal.is_set():
+                    return None
+                return results
+            table_idx, future = pending.popleft()
+            outcome = self._wait(future, stop_signal)
+            if outcome is None:
+                self._cancel(pending)
+                return None
+            table_data, fallback_cells = outcome
+            results[table_idx] = (results[table_idx][0] + table_data, results[table_idx][1] + fallback_cells)
+
+    def _cancel(self, pending):
+        for _, future in pending:
+            future.cancel()
+        pending.clear()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
@@ -0,0 +1,118 @@
+"""Rasterisasi halaman PDF secara bertahap dengan Poppler (pdf2image)."""
+import os
+
+from PIL import Image
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+# ===================================================================
+# SUMBER HALAMAN PDF (RASTERISASI BERTAHAP)
+# ===================================================================
+PDF_DPI = 200
+IMAGE_CACHE_DIR = "temp_pdf_images"
+# Jumlah halaman yang dirasterisasi per panggilan Poppler
+RASTER_WINDOW = 4
+# Batas jumlah PNG di cache disk (0 = tanpa cache disk, gambar hanya di memori)
+IMAGE_CACHE_MAX_PAGES = 0
+POPPLER_PATHS = [
+    r"D:\Release-24.08.0-0\poppler-24.08.0\Library\bin",
+    r"C:\Program Files\poppler\bin",
+    "/usr/bin",
+    "/usr/local/bin",
+]
+
+def find_poppler_path():
+    for path in POPPLER_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+def page_runs(pages, window):
+    """Mengelompokkan nomor halaman terurut menjadi rentang berurutan sepanjang maksimal `window`."""
+    run = []
+    for page_num in pages:
+        if run and (page_num != run[-1] + 1 or len(run) >= window):
+            yield run
+            run = []
+        run.append(page_num)
+    if run:
+        yield run
+
+class PdfPageSource:
+    """Merasterisasi halaman PDF sesuai kebutuhan, beberapa halaman sekaligus.
+
+    Gambar diserahkan langsung sebagai PIL Image tanpa melewati disk. Jika `cache_dir`
+    dan `cache_max_pages` diisi, PNG disimpan juga ke disk dan yang paling lama tidak
+    dipakai dihapus saat jumlahnya melebihi batas.
+    """
+    def __init__(self, pdf_path, dpi=PDF_DPI, window=RASTER_WINDOW, cache_dir=None,
+                 cache_max_pages=IMAGE_CACHE_MAX_PAGES, poppler_path=None):
+        self.pdf_path = pdf_path
+        self.dpi = dpi
+        self.window = max(1, window)
+        self.cache_dir = cache_dir if cache_max_pages > 0 else None
+        self.cache_max_pages = cache_max_pages
+        self.poppler_path = poppler_path or find_poppler_path()
+
+    def page_count(self):
+        info = pdfinfo_from_path(self.pdf_path, poppler_path=self.poppler_path)
+        return int(info["Pages"])
+
+    def _cache_path(self, page_num):
+        return os.path.join(self.cache_dir, f"page_{page_num:05d}.png")
+
+    def _load_cached(self, page_num):
+        path = self._cache_path(page_num)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)
+        return Image.open(path).convert("RGB")
+
+    def _store_cached(self, page_num, image):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        image.save(self._cache_path(page_num))
+        cached = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".png")]
+        if len(cached) > self.cache_max_pages:
+            cached.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in cached[:len(cached) - self.cache_max_pages]:
+                os.remove(entry.path)
+
+    def _render(self, first_page, last_page):
+        return convert_from_path(
+            self.pdf_path,
+            dpi=self.dpi,
+            first_page=first_page,
+            last_page=last_page,
+            thread_count=min(4, last_page - first_page + 1),
+            poppler_path=self.poppler_path
+        )
+
+    def iter_pages(self, pages, on_error=None):
+        """Menghasilkan (page_num, image) untuk nomor halaman terurut di `pages`.
+
+        Halaman yang gagal dirasterisasi dilewati; `on_error(page_num, exc)` dipanggil jika ada.
+        """
+        for run in page_runs(pages, self.window):
+            images = {}
+            if self.cache_dir:
+                for page_num in run:
+                    image = self._load_cached(page_num)
+                    if image is not None:
+                        images[page_num] = image
+            missing = [page_num for page_num in run if page_num not in images]
+            if missing:
+                try:
+                    rendered = self._render(missing[0], missing[-1])
+                except Exception as e:
+                    for page_num in missing:
+                        if on_error is not None:
+                            on_error(page_num, e)
+                    rendered = []
+                for page_num, image in zip(range(missing[0], missing[-1] + 1), rendered):
+                    if page_num in images:
+                        continue
+                    images[page_num] = image.convert("RGB")
+                    if self.cache_dir:
+                        self._store_cached(page_num, images[page_num])
+            for page_num in run:
+                if page_num in images:
+                    yield page_num, images.pop(page_num)
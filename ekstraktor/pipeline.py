@@ -0,0 +1,491 @@
+"""Pipeline ekstraksi satu dokumen: muat -> deteksi -> struktur -> OCR -> tulis."""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from queue import Queue, Empty
+
+from .cache import (
+    RESULT_CACHE_PATH, RESULT_CACHE_MAX_BYTES, ResultCache, file_sha256, image_sha256,
+    page_cache_key, result_cache_settings
+)
+from .memory import (
+    WORKER_MEMORY_LIMIT_MB, MEMORY_SHRINK, MEMORY_RELEASE, MEMORY_RESTART, MemoryGovernor, worker_memory_limit
+)
+from .metrics import METRICS_EXPORT, PipelineMetrics
+from .models import (
+    INFERENCE_BATCH_SIZE, DETECTION_BACKEND, STRUCTURE_BACKEND, MODEL_SNAPSHOT_DIR, MODEL_OFFLINE, TableModels
+)
+from .ocr import (
+    OCR_MODE, OCR_WORKERS, OCR_EXECUTOR, OCR_MAX_IN_FLIGHT, OcrExecutor, assign_words_to_cells, get_cell_coordinates,
+    ignore_interrupts
+)
+from .pages import PDF_DPI, IMAGE_CACHE_MAX_PAGES, PdfPageSource
+from .textlayer import TEXT_LAYER_MODE, TextLayer, infer_structure, words_in_box
+from .writers import OUTPUT_FORMATS, COMMIT_EVERY_PAGES, TableWriter
+
+# ===================================================================
+# PIPELINE BERTAHAP: muat gambar -> deteksi -> struktur -> OCR -> tulis
+# ===================================================================
+# Kapasitas antrean antar tahap (dalam halaman); membatasi memori sekaligus
+# memungkinkan inferensi halaman N+1 berjalan saat halaman N di-OCR.
+PIPELINE_QUEUE_SIZE = 2
+PIPELINE_REPORT_INTERVAL = 15.0
+# Waktu tunggu maksimal untuk mengisi batch sebelum batch yang ada diproses
+PIPELINE_BATCH_WAIT = 0.2
+
+_STAGE_END = object()
+
+@dataclass
+class TableJob:
+    index: int
+    box: list
+    image: object = None
+    row_boxes: list = None
+    column_boxes: list = None
+    cell_coordinates: list = None
+    # Kata lapisan teks PDF di dalam tabel (koordinat potongan); None = lewat OCR
+    words: list = None
+    data: list = None
+    fallback_cells: int = 0
+
+@dataclass
+class PageJob:
+    page_num: int
+    image: object = None
+    tables: list = field(default_factory=list)
+    # Kunci cache hasil halaman ini; from_cache=True berarti tabel sudah lengkap dari cache
+    cache_keys: list = field(default_factory=list)
+    from_cache: bool = False
+    # Kata lapisan teks PDF (koordinat gambar halaman); None = halaman pindaian
+    words: list = None
+
+def page_to_cache(page):
+    return {"tables": [
+        {"index": t.index, "box": t.box, "row_boxes": t.row_boxes, "column_boxes": t.column_boxes, "data": t.data}
+        for t in page.tables
+    ]}
+
+def page_from_cache(page_num, value):
+    tables = [
+        TableJob(t["index"], t["box"], row_boxes=t["row_boxes"], column_boxes=t["column_boxes"], data=t["data"])
+        for t in value["tables"]
+    ]
+    return PageJob(page_num, tables=tables, from_cache=True)
+
+def lookup_cached_page(result_cache, pdf_hash, page_num, settings):
+    """Mencari hasil halaman berdasarkan hash PDF; mengembalikan PageJob dari cache atau None."""
+    cached = result_cache.get(page_cache_key(pdf_hash, page_num, settings), record_miss=False)
+    return page_from_cache(page_num, cached) if cached is not None else None
+
+def prepare_rendered_page(result_cache, pdf_hash, page_num, image, settings):
+    """Membuat PageJob dari gambar halaman.
+
+    Halaman identik dari dokumen lain dicocokkan lewat hash gambar dan langsung diambil
+    dari cache; jika tidak ada, kunci cache dipasang agar hasilnya disimpan nanti.
+    """
+    page = PageJob(page_num, image)
+    if result_cache is None:
+        return page
+    image_key = page_cache_key(image_sha256(image), 0, settings)
+    doc_key = page_cache_key(pdf_hash, page_num, settings)
+    cached = result_cache.get(image_key)
+    if cached is None:
+        page.cache_keys = [doc_key, image_key]
+        return page
+    result_cache.put([doc_key], cached)
+    return page_from_cache(page_num, cached)
+
+def detect_pages(models, pages):
+    """Mengisi page.tables untuk halaman yang belum berasal dari cache (satu batch)."""
+    pages_to_detect = [page for page in pages if not page.from_cache]
+    if pages_to_detect:
+        for page, table_boxes in zip(pages_to_detect, models.detect_tables([page.image for page in pages_to_detect])):
+            page.tables = [TableJob(idx, box) for idx, box in enumerate(table_boxes)]
+    return pages
+
+def recognize_pages(models, pages, text_layer_mode=TEXT_LAYER_MODE):
+    """Mengenali struktur semua potongan tabel dari sekumpulan halaman sekaligus.
+
+    Pada halaman dengan lapisan teks, kata di dalam setiap tabel disimpan di table.words;
+    dengan mode 'full' baris/kolom tabel tersebut disimpulkan dari perataan kata dan
+    model struktur hanya dijalankan untuk tabel yang tidak meyakinkan.
+    """
+    tables = []
+    pages_to_recognize = [page for page in pages if not page.from_cache]
+    for page in pages_to_recognize:
+        for table in page.tables:
+            if page.words is not None:
+                table.words = words_in_box(page.words, table.box) or None
+            if table.words is not None and text_layer_mode == "full":
+                width, height = table.box[2] - table.box[0], table.box[3] - table.box[1]
+                structure = infer_structure(table.words, width, height)
+                if structure is not None:
+                    table.row_boxes, table.column_boxes = structure
+                    table.cell_coordinates = get_cell_coordinates(*structure)
+                    continue
+            table.image = page.image.crop(table.box)
+            tables.append(table)
+    for table, (row_boxes, column_boxes) in zip(tables, models.recognize_structure([t.image for t in tables])):
+        if row_boxes and column_boxes:
+            table.row_boxes, table.column_boxes = row_boxes, column_boxes
+            table.cell_coordinates = get_cell_coordinates(row_boxes, column_boxes)
+    for page in pages_to_recognize:
+        page.tables = [t for t in page.tables if t.cell_coordinates]
+        page.image = None
+    return pages
+
+def ocr_page(ocr_pool, page, stop_signal=None):
+    """Mengisi table.data untuk semua tabel halaman; None jika dihentikan stop_signal.
+
+    Tabel dengan kata lapisan teks diisi langsung tanpa Tesseract; kata yang melintasi
+    batas sel tetap masuk ke sel dengan irisan terbesar.
+    """
+    if page.from_cache:
+        return page
+    for table in page.tables:
+        if table.words is not None:
+            table.data, _ = assign_words_to_cells(table.words, table.cell_coordinates)
+            table.words = table.image = None
+    scanned = [t for t in page.tables if t.data is None]
+    ocr_results = ocr_pool.ocr_tables([(t.image, t.cell_coordinates) for t in scanned], stop_signal)
+    if ocr_results is None:
+        return None
+    for table, (table_data, fallback_cells) in zip(scanned, ocr_results):
+        table.data, table.fallback_cells = table_data, fallback_cells
+        table.image = None
+    return page
+
+def page_cell_count(page):
+    """Jumlah sel (dari struktur) di semua tabel halaman."""
+    return sum(len(row) for table in page.tables for row in (table.cell_coordinates or []))
+
+def count_page(metrics, page):
+    """Menambah penghitung halaman, tabel, dan sel untuk satu halaman selesai."""
+    tables = [table for table in page.tables if table.data]
+    metrics.count("pages")
+    if page.from_cache:
+        metrics.count("pages_cached")
+    metrics.count("tables", len(tables))
+    metrics.count("cells", sum(len(row) for table in tables for row in table.data))
+
+def timed_stage(metrics, stage, func, pages):
+    """Menjalankan func(pages) untuk satu batch dan mencatat durasinya per halaman dan tabel."""
+    pages_to_time = [page for page in pages if not page.from_cache]
+    start = time.perf_counter()
+    result = func(pages)
+    if pages_to_time:
+        metrics.observe(stage, time.perf_counter() - start, pages=len(pages_to_time),
+                        tables=sum(len(page.tables) for page in pages_to_time))
+    return result
+
+class PipelineStage(threading.Thread):
+    """Satu tahap pipeline yang berjalan di thread sendiri.
+
+    Mengambil job dari `inbox`, memanggil `func(job)`, lalu meneruskan hasilnya ke
+    `outbox`. Jika `func` mengembalikan None, job dibuang. Dengan `batch_size`, `func`
+    menerima list hingga `batch_size` job dan mengembalikan list hasil. Setelah error,
+    tahap tetap menguras `inbox` sampai penanda akhir agar tahap sebelumnya tidak macet.
+    """
+    def __init__(self, name, func, inbox, outbox, abort, batch_size=None):
+        super().__init__(name=name, daemon=True)
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.abort = abort
+        self.batch_size = batch_size
+        self.busy_time = 0.0
+        self.processed = 0
+        self.error = None
+
+    def _next_jobs(self):
+        """Mengambil job berikutnya; mengembalikan (jobs, penanda akhir sudah diterima)."""
+        job = self.inbox.get()
+        if job is _STAGE_END:
+            return [], True
+        jobs = [job]
+        deadline = time.monotonic() + PIPELINE_BATCH_WAIT
+        while self.batch_size is not None and len(jobs) < self.batch_size:
+            try:
+                job = self.inbox.get(timeout=max(0.0, deadline - time.monotonic()))
+            except Empty:
+                break
+            if job is _STAGE_END:
+                return jobs, True
+            jobs.append(job)
+        return jobs, False
+
+    def run(self):
+        # Ctrl+C ditangani thread utama lewat stop_signal; Tesseract/Poppler dari thread ini tidak ikut terhenti
+        ignore_interrupts()
+        finished = False
+        while not finished:
+            jobs, finished = self._next_jobs()
+            if not jobs or self.abort.is_set():
+                continue
+            start = time.perf_counter()
+            try:
+                results = self.func(jobs) if self.batch_size is not None else [self.func(jobs[0])]
+            except Exception as e:
+                self.error = e
+                self.abort.set()
+                continue
+            finally:
+                self.busy_time += time.perf_counter() - start
+            self.processed += len(jobs)
+            if self.outbox is not None:
+                for result in results:
+                    if result is not None:
+                        self.outbox.put(result)
+        if self.outbox is not None:
+            self.outbox.put(_STAGE_END)
+
+    def status(self):
+        depth = self.inbox.qsize()
+        return f"{self.name}: antre {depth}/{self.inbox.maxsize}, sibuk {self.busy_time:.1f}s, {self.processed} job"
+
+class PipelineSource(PipelineStage):
+    """Tahap pertama: menghasilkan job dari iterator, bukan dari antrean."""
+    def __init__(self, name, jobs, outbox, abort, stop_signal):
+        super().__init__(name, None, None, outbox, abort)
+        self.jobs = jobs
+        self.stop_signal = stop_signal
+
+    def run(self):
+        ignore_interrupts()
+        try:
+            while not (self.abort.is_set() or self.stop_signal.is_set()):
+                start = time.perf_counter()
+                try:
+                    job = next(self.jobs, None)
+                finally:
+                    self.busy_time += time.perf_counter() - start
+                if job is None:
+                    break
+                self.processed += 1
+                self.outbox.put(job)
+        except Exception as e:
+            self.error = e
+            self.abort.set()
+        finally:
+            self.outbox.put(_STAGE_END)
+
+    def status(self):
+        return f"{self.name}: sibuk {self.busy_time:.1f}s, {self.processed} job"
+
+def run_pipeline(stages, queue, report_interval=PIPELINE_REPORT_INTERVAL):
+    """Menjalankan semua tahap dan melaporkan kedalaman antrean serta waktu sibuk."""
+    for stage in stages:
+        stage.start()
+    last_report = time.monotonic()
+    for stage in stages:
+        while stage.is_alive():
+            stage.join(timeout=0.5)
+            if time.monotonic() - last_report >= report_interval:
+                queue.put(("LOG", "[PIPELINE] " + " | ".join(s.status() for s in stages)))
+                last_report = time.monotonic()
+    queue.put(("LOG", "[PIPELINE] Ringkasan: " + " | ".join(s.status() for s in stages)))
+    for stage in stages:
+        if stage.error is not None:
+            raise stage.error
+
+def extraction_worker(queue, pdf_path, image_dir, output_csv, pages, stop_signal,
+                      ocr_mode=OCR_MODE, ocr_workers=OCR_WORKERS, ocr_executor=OCR_EXECUTOR,
+                      ocr_max_in_flight=OCR_MAX_IN_FLIGHT, batch_size=INFERENCE_BATCH_SIZE,
+                      dpi=PDF_DPI, image_cache_max_pages=IMAGE_CACHE_MAX_PAGES,
+                      result_cache_path=RESULT_CACHE_PATH, result_cache_max_bytes=RESULT_CACHE_MAX_BYTES,
+                      output_formats=OUTPUT_FORMATS, commit_every=COMMIT_EVERY_PAGES,
+                      memory_limit_mb=WORKER_MEMORY_LIMIT_MB, detection_backend=DETECTION_BACKEND,
+                      structure_backend=STRUCTURE_BACKEND, model_dir=MODEL_SNAPSHOT_DIR, model_offline=MODEL_OFFLINE,
+                      text_layer=TEXT_LAYER_MODE, metrics_export=METRICS_EXPORT, allow_restart=False):
+    """Mengekstrak tabel dari halaman `pages` di `pdf_path` dan menambahkannya ke `output_csv`.
+
+    `pages` adalah daftar terurut nomor halaman tertunda yang boleh tidak bersambung
+    (lihat api.find_pending_pages); halaman yang selesai dicatat di manifest output.
+
+    Halaman dirasterisasi sesuai kebutuhan; `image_dir` hanya dipakai sebagai cache PNG
+    (per hash PDF) jika `image_cache_max_pages` > 0. Hasil per halaman disimpan di cache
+    `result_cache_path` (None = nonaktif) dan dipakai ulang tanpa inferensi maupun OCR.
+    Halaman dengan lapisan teks yang layak diisi dari teks PDF, bukan OCR (lihat `text_layer`).
+    Output ditulis per `commit_every` halaman ke setiap format di `output_formats`.
+    Durasi setiap tahap dicatat di PipelineMetrics dan, jika `metrics_export`, disimpan
+    berkala ke `<output_csv>.metrics.json` dan `<output_csv>.metrics.prom`.
+
+    RSS worker diperiksa setelah setiap halaman (lihat MemoryGovernor). Jika tetap di atas
+    `memory_limit_mb` dan `allow_restart` (pemanggil sanggup memulai ulang worker, mis. GUI),
+    worker mengirim ("RESTART", alasan) lalu berhenti rapi; pemanggil memulai worker baru
+    untuk halaman yang masih tertunda. Tanpa `allow_restart` batas memori hanya memperkecil
+    jendela dan melepas cache.
+    """
+    ocr_pool = None
+    result_cache = None
+    try:
+        pdf_hash = file_sha256(pdf_path)
+        page_source = PdfPageSource(pdf_path, dpi=dpi, cache_dir=os.path.join(image_dir, pdf_hash[:16]),
+                                    cache_max_pages=image_cache_max_pages)
+        total_pages = page_source.page_count()
+        cache_settings = result_cache_settings(dpi, ocr_mode, detection_backend, structure_backend, text_layer)
+        text_source = TextLayer(pdf_path, dpi=dpi) if text_layer != "off" else None
+        if result_cache_path:
+            result_cache = ResultCache(result_cache_path, result_cache_max_bytes)
+        writer = TableWriter(output_csv, formats=output_formats, commit_every=commit_every)
+        writer.manifest.total_pages = total_pages
+        metrics = PipelineMetrics()
+        last_metrics_save = time.monotonic()
+
+        # Model dimuat saat halaman pertama yang tidak ada di cache mencapai tahap deteksi
+        models = TableModels(batch_size=batch_size, snapshot_dir=model_dir, detection_backend=detection_backend,
+                             structure_backend=structure_backend, offline=model_offline)
+        ocr_pool = OcrExecutor(workers=ocr_workers, kind=ocr_executor, mode=ocr_mode, max_in_flight=ocr_max_in_flight)
+        queue.put(("LOG", f"Pool OCR: {ocr_pool.workers} worker ({ocr_executor}), mode {ocr_mode}."))
+
+        def report_raster_error(page_num, e):
+            queue.put(("LOG", f"!!! Gagal merasterisasi halaman {page_num}: {e}"))
+            queue.put(("PAGE_FAILED", {"page": page_num, "error": f"Gagal merasterisasi: {e}"}))
+
+        def render_pages(page_numbers):
+            start = time.perf_counter()
+            for page_num, image in page_source.iter_pages(page_numbers, on_error=report_raster_error):
+                metrics.observe("rasterize", time.perf_counter() - start, pages=1)
+                queue.put(("LOG", f"\n--- Memproses Halaman {page_num}/{total_pages} ---"))
+                page = prepare_rendered_page(result_cache, pdf_hash, page_num, image, cache_settings)
+                if page.from_cache:
+                    queue.put(("LOG", f"Halaman {page_num} identik dengan halaman di cache."))
+                elif text_source is not None:
+                    page.words = text_source.page_words(page_num)
+                    if page.words is not None:
+                        metrics.count("pages_text_layer")
+                        queue.put(("LOG", f"Halaman {page_num}: lapisan teks dipakai ({len(page.words)} kata), OCR dilewati."))
+                yield page
+                start = time.perf_counter()
+
+        def load_pages():
+            pending = []
+            for page_num in pages:
+                cached_page = None
+                if result_cache is not None:
+                    cached_page = lookup_cached_page(result_cache, pdf_hash, page_num, cache_settings)
+                if cached_page is None:
+                    pending.append(page_num)
+                    continue
+                yield from render_pages(pending)
+                pending = []
+                queue.put(("LOG", f"\n--- Halaman {page_num}/{total_pages} diambil dari cache ---"))
+                yield cached_page
+            yield from render_pages(pending)
+
+        def detect(pages):
+            if stop_signal.is_set():
+                return []
+            if not models.loaded and not all(page.from_cache for page in pages):
+                queue.put(("LOG", "Memuat model (Proses Worker Baru)..."))
+                start = time.perf_counter()
+                models.load()
+                metrics.observe_model_load(time.perf_counter() - start)
+                queue.put(("LOG", f"Model berhasil dimuat di worker ({models.describe()}, batch {models.batch_size})."))
+            for page in timed_stage(metrics, "detection", lambda batch: detect_pages(models, batch), pages):
+                if page.from_cache:
+                    continue
+                if not page.tables:
+                    queue.put(("LOG", f"Tidak ada tabel di halaman {page.page_num}."))
+                else:
+                    queue.put(("LOG", f"Ditemukan {len(page.tables)} tabel di halaman {page.page_num}."))
+            return pages
+
+        def recognize(pages):
+            # Semua potongan tabel dari satu jendela halaman dikenali bersama
+            if stop_signal.is_set():
+                return []
+            return timed_stage(metrics, "structure", lambda batch: recognize_pages(models, batch, text_layer), pages)
+
+        def ocr(page):
+            # Setelah sinyal berhenti, semua halaman berikutnya dibuang; halaman tersebut
+            # tetap tertunda di manifest dan diproses saat resume.
+            if stop_signal.is_set():
+                return None
+            start = time.perf_counter()
+            if ocr_page(ocr_pool, page, stop_signal) is None:
+                queue.put(("LOG", f"Sinyal berhenti diterima saat OCR. Halaman {page.page_num} akan diulang."))
+                return None
+            if not page.from_cache:
+                metrics.observe("ocr", time.perf_counter() - start, pages=1, tables=len(page.tables),
+                                cells=page_cell_count(page))
+            return page
+
+        def report_commit(page_numbers):
+            nonlocal last_metrics_save
+            # PROGRESS baru dikirim setelah halaman benar-benar ter-commit ke disk
+            for page_num in page_numbers:
+                queue.put(("PROGRESS", page_num))
+            if metrics_export and page_numbers and time.monotonic() - last_metrics_save >= PIPELINE_REPORT_INTERVAL:
+                metrics.save(output_csv)
+                last_metrics_save = time.monotonic()
+
+        def write(page):
+            start = time.perf_counter()
+            tables = []
+            for table in page.tables:
+                if table.fallback_cells:
+                    queue.put(("LOG", f"  OCR ulang per sel: {table.fallback_cells} sel ambigu."))
+                if table.data:
+                    tables.append((table.index, table.data))
+                    queue.put(("LOG", f"  Halaman {page.page_num}, Tabel #{table.index + 1} disimpan. [{len(table.data)} baris]"))
+            if result_cache is not None and page.cache_keys:
+                result_cache.put(page.cache_keys, page_to_cache(page))
+            report_commit(writer.add_page(page.page_num, tables))
+            metrics.observe("write", time.perf_counter() - start, pages=1)
+            count_page(metrics, page)
+            check_memory(page.page_num)
+            return None
+
+        restart_warned = False
+
+        def check_memory(page_num):
+            nonlocal restart_warned
+            action, rss = governor.check()
+            rss_mb, limit_mb = rss / 1024 / 1024, governor.limit_bytes / 1024 / 1024
+            if action == MEMORY_SHRINK:
+                queue.put(("LOG", f"[MEMORI] RSS worker {rss_mb:.0f}/{limit_mb:.0f} MB: jendela diperkecil ({governor.describe()})."))
+            elif action == MEMORY_RELEASE:
+                queue.put(("LOG", f"[MEMORI] RSS worker {rss_mb:.0f}/{limit_mb:.0f} MB setelah cache dilepas."))
+            elif action == MEMORY_RESTART and allow_restart and not stop_signal.is_set():
+                queue.put(("RESTART", f"RSS worker {rss_mb:.0f} MB melewati batas {limit_mb:.0f} MB setelah halaman {page_num}."))
+                stop_signal.set()
+            elif action == MEMORY_RESTART and not restart_warned:
+                restart_warned = True
+                queue.put(("LOG", f"!!! [MEMORI] RSS {rss_mb:.0f} MB melewati batas {limit_mb:.0f} MB."))
+
+        abort = threading.Event()
+        # Antrean masuk tahap inferensi harus muat satu batch penuh
+        queue_size = max(PIPELINE_QUEUE_SIZE, models.batch_size)
+        inboxes = [Queue(maxsize=queue_size), Queue(maxsize=queue_size),
+                   Queue(maxsize=PIPELINE_QUEUE_SIZE), Queue(maxsize=PIPELINE_QUEUE_SIZE)]
+        stages = [
+            PipelineSource("muat", load_pages(), inboxes[0], abort, stop_signal),
+            PipelineStage("deteksi", detect, inboxes[0], inboxes[1], abort, batch_size=models.batch_size),
+            PipelineStage("struktur", recognize, inboxes[1], inboxes[2], abort, batch_size=models.batch_size),
+            PipelineStage("ocr", ocr, inboxes[2], inboxes[3], abort),
+            PipelineStage("tulis", write, inboxes[3], None, abort),
+        ]
+        governor = MemoryGovernor(worker_memory_limit(memory_limit_mb), models, ocr_pool, stages)
+        run_pipeline(stages, queue)
+        # Halaman di buffer sudah lengkap, termasuk saat berhenti di tengah jalan
+        report_commit(writer.close())
+        if result_cache is not None:
+            stats = result_cache.stats()
+            queue.put(("LOG", f"[CACHE] hit {stats['hits']}, miss {stats['misses']}, "
+                              f"{stats['entries']} entri, {stats['bytes'] / 1024 / 1024:.1f} MB"))
+        queue.put(("LOG", f"[MEMORI] Puncak RSS worker: {governor.peak_rss / 1024 / 1024:.0f} MB"))
+        queue.put(("LOG", f"[METRIK] {metrics.report()}"))
+        if metrics_export:
+            metrics.save(output_csv)
+        if stop_signal.is_set():
+            queue.put(("LOG", "Sinyal berhenti diterima. Menutup worker."))
+        queue.put(("DONE", "Proses worker selesai."))
+    except Exception as e:
+        queue.put(("ERROR", f"Error di worker: {e}"))
+    finally:
+        if ocr_pool is not None:
+            ocr_pool.shutdown()
+        if result_cache is not None:
+            result_cache.close()
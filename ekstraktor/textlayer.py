@@ -0,0 +1,128 @@
+"""Lapisan teks PDF digital: kata beserta koordinatnya dari `pdftotext -bbox` (Poppler)."""
+import html
+import os
+import re
+import subprocess
+
+# ===================================================================
+# LAPISAN TEKS (PDF DIGITAL)
+# ===================================================================
+# 'off'   = selalu OCR
+# 'cells' = halaman dengan lapisan teks mengisi sel dari teks PDF, tanpa Tesseract
+# 'full'  = seperti 'cells', dan baris/kolom disimpulkan dari perataan teks (tanpa model struktur)
+TEXT_LAYER_MODES = ("off", "cells", "full")
+TEXT_LAYER_MODE = "cells"
+# Jumlah halaman yang dibaca per panggilan pdftotext
+TEXT_LAYER_WINDOW = 8
+# Lapisan teks dianggap layak jika kata cukup banyak dan hampir semua karakternya terbaca
+TEXT_LAYER_MIN_WORDS = 10
+TEXT_LAYER_MIN_READABLE = 0.9
+# Celah horizontal (kelipatan tinggi kata median) yang memisahkan dua kolom
+TEXT_LAYER_COLUMN_GAP = 1.0
+
+_PAGE_RE = re.compile(r'<page width="([\d.]+)" height="([\d.]+)">(.*?)</page>', re.S)
+_WORD_RE = re.compile(r'<word xMin="([\d.]+)" yMin="([\d.]+)" xMax="([\d.]+)" yMax="([\d.]+)">(.*?)</word>', re.S)
+
+def parse_bbox_html(text, scale):
+    """Mengurai output `pdftotext -bbox` menjadi list kata per halaman (koordinat piksel)."""
+    pages = []
+    for match in _PAGE_RE.finditer(text):
+        words = []
+        for x_min, y_min, x_max, y_max, word in _WORD_RE.findall(match.group(3)):
+            word = html.unescape(word).strip()
+            if word:
+                box = [float(x_min) * scale, float(y_min) * scale, float(x_max) * scale, float(y_max) * scale]
+                words.append({'text': word, 'conf': 100.0, 'box': box})
+        pages.append(words)
+    return pages
+
+def is_usable(words):
+    """True jika lapisan teks cukup lengkap dan tidak berisi karakter rusak (font tanpa peta Unicode)."""
+    if len(words) < TEXT_LAYER_MIN_WORDS:
+        return False
+    chars = "".join(word['text'] for word in words)
+    readable = sum(ch.isprintable() and ch != "�" for ch in chars)
+    return readable / max(len(chars), 1) >= TEXT_LAYER_MIN_READABLE
+
+class TextLayer:
+    """Membaca lapisan teks beberapa halaman sekaligus per panggilan `pdftotext`.
+
+    page_words() mengembalikan kata halaman dalam koordinat gambar ber-DPI `dpi`, atau
+    None jika halaman tidak punya lapisan teks yang layak (mis. hasil pindaian).
+    """
+    def __init__(self, pdf_path, dpi, window=TEXT_LAYER_WINDOW, poppler_path=None):
+        from .pages import find_poppler_path
+
+        self.pdf_path = pdf_path
+        self.scale = dpi / 72.0
+        self.window = max(1, window)
+        poppler_path = poppler_path or find_poppler_path()
+        self.executable = os.path.join(poppler_path, "pdftotext") if poppler_path else "pdftotext"
+        self.available = True
+        self._pages = {}
+
+    def _load(self, first_page, last_page):
+        result = subprocess.run(
+            [self.executable, "-bbox", "-enc", "UTF-8", "-f", str(first_page), "-l", str(last_page), self.pdf_path, "-"],
+            capture_output=True, check=True,
+        )
+        pages = parse_bbox_html(result.stdout.decode("utf-8", errors="replace"), self.scale)
+        for offset, words in enumerate(pages):
+            self._pages[first_page + offset] = words if is_usable(words) else None
+
+    def page_words(self, page_num):
+        """Halaman diminta berurutan naik; halaman jendela yang terlewati (tidak tertunda) dibuang."""
+        if not self.available:
+            return None
+        for stale in [page for page in self._pages if page < page_num]:
+            del self._pages[stale]
+        if page_num not in self._pages:
+            try:
+                self._load(page_num, page_num + self.window - 1)
+            except (OSError, subprocess.CalledProcessError):
+                # pdftotext tidak tersedia atau gagal: semua halaman lewat jalur OCR
+                self.available = False
+                return None
+        return self._pages.pop(page_num, None)
+
+def words_in_box(words, box):
+    """Kata yang titik tengahnya berada di dalam `box`, digeser ke koordinat lokal box."""
+    left, top, right, bottom = box
+    local = []
+    for word in words:
+        x0, y0, x1, y1 = word['box']
+        if left <= (x0 + x1) / 2 <= right and top <= (y0 + y1) / 2 <= bottom:
+            local.append({'text': word['text'], 'conf': word['conf'], 'box': [x0 - left, y0 - top, x1 - left, y1 - top]})
+    return local
+
+def infer_structure(words, width, height):
+    """(row_boxes, column_boxes) dari perataan kata di dalam tabel; None jika tidak meyakinkan.
+
+    Baris = kelompok kata yang bertumpuk secara vertikal; kolom = rentang horizontal kata
+    yang digabung selama celahnya lebih kecil dari TEXT_LAYER_COLUMN_GAP tinggi kata.
+    Batas diletakkan di tengah celah dan dilebarkan sampai tepi tabel.
+    """
+    if not words:
+        return None
+    rows = []
+    for word in sorted(words, key=lambda w: w['box'][1]):
+        center_y = (word['box'][1] + word['box'][3]) / 2
+        if rows and rows[-1][0] <= center_y <= rows[-1][1]:
+            rows[-1][1] = max(rows[-1][1], word['box'][3])
+        else:
+            rows.append([word['box'][1], word['box'][3]])
+    heights = sorted(word['box'][3] - word['box'][1] for word in words)
+    gap = heights[len(heights) // 2] * TEXT_LAYER_COLUMN_GAP
+    spans = []
+    for word in sorted(words, key=lambda w: w['box'][0]):
+        if spans and word['box'][0] - spans[-1][1] <= gap:
+            spans[-1][1] = max(spans[-1][1], word['box'][2])
+        else:
+            spans.append([word['box'][0], word['box'][2]])
+    if len(rows) < 2 or len(spans) < 2:
+        return None
+    row_edges = [0] + [(a[1] + b[0]) / 2 for a, b in zip(rows, rows[1:])] + [height]
+    col_edges = [0] + [(a[1] + b[0]) / 2 for a, b in zip(spans, spans[1:])] + [width]
+    row_boxes = [[0, row_edges[i], width, row_edges[i + 1]] for i in range(len(rows))]
+    column_boxes = [[col_edges[i], 0, col_edges[i + 1], height] for i in range(len(spans))]
+    return row_boxes, column_boxes
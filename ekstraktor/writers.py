@@ -0,0 +1,289 @@
+"""Penulis output: baris di-buffer per halaman dan ditulis dalam commit atomik ke CSV dan/atau Parquet."""
+import csv
+import io
+import json
+import os
+
+# ===================================================================
+# PENULISAN OUTPUT
+# ===================================================================
+OUTPUT_FORMATS = ("csv",)
+SUPPORTED_FORMATS = ("csv", "parquet")
+# Jumlah halaman yang di-buffer sebelum satu commit ke disk
+COMMIT_EVERY_PAGES = 1
+ID_COLUMNS = ["page_number", "table_on_page"]
+
+def output_paths(output_path, formats=OUTPUT_FORMATS):
+    """Path output per format; ekstensi `output_path` diganti sesuai format bila berbeda."""
+    base, ext = os.path.splitext(output_path)
+    return {fmt: output_path if ext.lower() == "." + fmt else base + "." + fmt for fmt in formats}
+
+def table_rows(page_num, tables):
+    """Mengubah [(table_idx, table_data), ...] menjadi baris [page_number, table_on_page, sel...]."""
+    return [[page_num, table_idx + 1] + list(row) for table_idx, table_data in tables for row in table_data]
+
+class ProgressManifest:
+    """Penanda halaman selesai untuk satu output, diperbarui setelah setiap commit.
+
+    Disimpan sebagai JSON di samping file output dan ditulis ulang secara atomik. Selain
+    himpunan halaman selesai, manifest mencatat status tiap format saat commit terakhir
+    (ukuran CSV beserta rentang byte tiap halaman, daftar part Parquet) sehingga sisa
+    commit yang terputus bisa dibuang dan resume tidak perlu membaca output.
+    """
+    def __init__(self, output_path):
+        self.path = output_path + ".progress.json"
+        self.total_pages = None
+        self.completed = set()
+        self.outputs = {}
+        self.exists = os.path.exists(self.path)
+        if self.exists:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.total_pages = state.get("total_pages")
+            self.completed = set(state.get("completed_pages", []))
+            self.outputs = state.get("outputs", {})
+
+    def pending_pages(self, total_pages):
+        return [page_num for page_num in range(1, total_pages + 1) if page_num not in self.completed]
+
+    def reset(self):
+        self.completed = set()
+        self.outputs = {}
+
+    def commit(self, page_numbers, outputs):
+        self.completed.update(page_numbers)
+        self.outputs.update(outputs)
+        self.save()
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"total_pages": self.total_pages, "completed_pages": sorted(self.completed),
+                       "outputs": self.outputs}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+class CsvSink:
+    """Menambahkan baris ke satu CSV; satu commit = satu write + fsync.
+
+    Rentang byte [awal, akhir) setiap halaman ikut dicatat di manifest.
+    """
+    format = "csv"
+
+    def __init__(self, path):
+        self.path = path
+        self.page_offsets = {}
+
+    def recover(self, state):
+        """Membuang sisa commit terputus; False jika output tidak cocok dengan manifest."""
+        if state is None:
+            return True
+        self.page_offsets = dict(state.get("pages", {}))
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size < state["bytes"]:
+            return False
+        # Byte setelah ukuran commit terakhir adalah sisa commit yang terputus
+        if size > state["bytes"]:
+            with open(self.path, "r+b") as f:
+                f.truncate(state["bytes"])
+        return True
+
+    def write(self, pages):
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        chunks, offset = [], size
+        for page_num, rows in pages:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator=os.linesep)
+            if offset == 0 and rows:
+                writer.writerow(ID_COLUMNS + [str(i) for i in range(len(rows[0]) - len(ID_COLUMNS))])
+            writer.writerows(rows)
+            chunk = buffer.getvalue().encode("utf-8")
+            self.page_offsets[str(page_num)] = [offset, offset + len(chunk)]
+            chunks.append(chunk)
+            offset += len(chunk)
+        if offset > size:
+            with open(self.path, "ab") as f:
+                f.write(b"".join(chunks))
+                f.flush()
+                os.fsync(f.fileno())
+        return {"bytes": offset, "pages": dict(self.page_offsets)}
+
+class ParquetSink:
+    """Menulis setiap commit sebagai satu file part di folder `<output>.parquet`.
+
+    Part ditulis ke file sementara lalu di-rename, sehingga hanya part yang utuh yang
+    pernah terlihat. Kolom sel bertipe string; lebar tabel boleh berbeda antar part.
+    """
+    format = "parquet"
+
+    def __init__(self, path):
+        self.path = path
+        self.parts = []
+
+    def recover(self, state):
+        """Menghapus part yang tidak tercatat; False jika part yang tercatat hilang.
+
+        Tanpa status di manifest berarti belum ada part yang ter-commit, jadi semua
+        part di folder dibuang dan tidak pernah diadopsi.
+        """
+        self.parts = list(state["parts"]) if state is not None else []
+        if not os.path.isdir(self.path):
+            return not self.parts
+        committed = set(self.parts)
+        if not committed.issubset(os.listdir(self.path)):
+            return False
+        for name in os.listdir(self.path):
+            # Part yang tidak tercatat di manifest berasal dari commit yang terputus atau run lain
+            if name not in committed:
+                os.remove(os.path.join(self.path, name))
+        self.parts.sort()
+        return True
+
+    def write(self, pages):
+        rows = [row for _, page_rows in pages for row in page_rows]
+        if rows:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            width = max(len(row) for row in rows)
+            columns = {
+                "page_number": pa.array([row[0] for row in rows], type=pa.int32()),
+                "table_on_page": pa.array([row[1] for row in rows], type=pa.int32()),
+            }
+            for col in range(len(ID_COLUMNS), width):
+                columns[str(col - len(ID_COLUMNS))] = pa.array(
+                    [row[col] if col < len(row) else None for row in rows], type=pa.string())
+            os.makedirs(self.path, exist_ok=True)
+            name = f"part-{len(self.parts):06d}.parquet"
+            tmp_path = os.path.join(self.path, name + ".tmp")
+            pq.write_table(pa.table(columns), tmp_path)
+            os.replace(tmp_path, os.path.join(self.path, name))
+            self.parts.append(name)
+        return {"parts": list(self.parts)}
+
+SINKS = {"csv": CsvSink, "parquet": ParquetSink}
+
+class TableWriter:
+    """Mengumpulkan tabel per halaman dan menulisnya ke semua format dalam satu commit.
+
+    Commit dilakukan setiap `commit_every` halaman (dan saat close). Setelah semua format
+    tertulis, halaman-halaman tersebut dicatat di manifest; saat dibuka kembali, data yang
+    tertulis setelah commit terakhir yang tercatat dibuang.
+    """
+    def __init__(self, output_path, formats=OUTPUT_FORMATS, commit_every=COMMIT_EVERY_PAGES, manifest=None):
+        unknown = [fmt for fmt in formats if fmt not in SINKS]
+        if unknown or not formats:
+            raise ValueError(f"Format output tidak dikenal: {', '.join(unknown) or '(kosong)'}")
+        self.commit_every = max(1, commit_every)
+        self.manifest = manifest or ProgressManifest(output_path)
+        self.sinks = [SINKS[fmt](path) for fmt, path in output_paths(output_path, formats).items()]
+        for sink in self.sinks:
+            state = self.manifest.outputs.get(sink.format)
+            # Format tanpa status padahal sudah ada halaman selesai akan menghasilkan output bolong
+            if (state is None and self.manifest.completed) or not sink.recover(state):
+                raise RuntimeError(f"Output {sink.path} tidak cocok dengan manifest {self.manifest.path}")
+        self._pages = []
+
+    def add_page(self, page_num, tables):
+        """Menambahkan satu halaman selesai; mengembalikan halaman yang ter-commit (bisa kosong)."""
+        self._pages.append((page_num, table_rows(page_num, tables)))
+        if len(self._pages) >= self.commit_every:
+            return self.commit()
+        return []
+
+    def commit(self):
+        if not self._pages:
+            return []
+        outputs = {sink.format: sink.write(self._pages) for sink in self.sinks}
+        committed = [page_num for page_num, _ in self._pages]
+        self.manifest.commit(committed, outputs)
+        self._pages = []
+        return committed
+
+    def close(self):
+        return self.commit()
+
+# ===================================================================
+# RESUME DARI MANIFEST
+# ===================================================================
+def _scan_legacy_csv(path):
+    """Nomor halaman terakhir dan offset awal barisnya di CSV tanpa manifest.
+
+    Batas record dicari dengan paritas tanda kutip, jadi sel berisi baris baru tetap aman.
+    """
+    last_page, last_start = None, 0
+    offset, in_quotes, header = 0, False, True
+    with open(path, "rb") as f:
+        for line in f:
+            start, offset = offset, offset + len(line)
+            at_record_start = not in_quotes
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            if not at_record_start:
+                continue
+            if header:
+                header = False
+                continue
+            try:
+                page_num = int(line.split(b",", 1)[0])
+            except ValueError:
+                continue
+            if page_num != last_page:
+                last_page, last_start = page_num, start
+    return last_page, last_start
+
+def load_progress(output_path, total_pages, formats=OUTPUT_FORMATS):
+    """Manifest resume yang konsisten dengan output di disk, tanpa membaca isi output.
+
+    Sisa commit yang terputus dibuang. Manifest yang tidak cocok dengan output, atau yang
+    sudah punya halaman selesai tetapi tidak punya status untuk salah satu format yang
+    diminta (mis. run CSV dilanjutkan dengan `csv,parquet`), diperlakukan seperti manifest
+    yang belum ada:
+
+    - Jika hanya CSV yang diminta (default), CSV dipindai sekali seperti output versi lama:
+      halaman sebelum halaman terakhir dianggap selesai, baris halaman terakhir (mungkin
+      tidak lengkap) dipotong.
+    - Jika ada format lain, format tersebut tidak punya salinan halaman CSV lama, jadi
+      semua halaman tertunda dan semua output dikosongkan.
+
+    Manifest baru lalu ditulis sehingga resume berikutnya langsung dari manifest.
+    """
+    manifest = ProgressManifest(output_path)
+    paths = output_paths(output_path, formats)
+    consistent = [SINKS[fmt](path).recover(manifest.outputs.get(fmt)) for fmt, path in paths.items()]
+    missing = manifest.completed and any(fmt not in manifest.outputs for fmt in paths)
+    if manifest.exists and (missing or not all(consistent)):
+        manifest.reset()
+        manifest.exists = False
+    csv_exists = "csv" in paths and os.path.exists(paths["csv"])
+    if not manifest.exists and csv_exists and set(paths) == {"csv"}:
+        last_page, last_start = _scan_legacy_csv(paths["csv"])
+        with open(paths["csv"], "r+b") as f:
+            f.truncate(last_start)
+        manifest.completed = set(range(1, last_page)) if last_page is not None else set()
+        manifest.outputs["csv"] = {"bytes": last_start, "pages": {}}
+    elif not manifest.exists:
+        # Format lain tidak punya salinan halaman CSV lama, jadi semua format mulai dari awal
+        if csv_exists:
+            with open(paths["csv"], "r+b") as f:
+                f.truncate(0)
+        for fmt, path in paths.items():
+            if fmt != "csv":
+                SINKS[fmt](path).recover(None)
+    manifest.total_pages = total_pages
+    manifest.save()
+    return manifest
+
+def read_parquet_output(path):
+    """Membaca semua part Parquet sebuah output menjadi satu pyarrow.Table."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    names = sorted(name for name in os.listdir(path) if name.endswith(".parquet"))
+    tables = [pq.read_table(os.path.join(path, name)) for name in names]
+    try:
+        return pa.concat_tables(tables, promote_options="default")
+    except TypeError:
+        # pyarrow < 14
+        return pa.concat_tables(tables, promote=True)
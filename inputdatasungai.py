@@ -1,159 +1,240 @@
 import sys
 import os
-import torch
-import pytesseract
-import pandas as pd
+import csv
+import io
 import psutil
 import time
 import multiprocessing
+from array import array
+from collections import OrderedDict
 from pathlib import Path
-from PIL import Image
-from pdf2image import convert_from_path
-from transformers import AutoImageProcessor, AutoModelForObjectDetection
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QFileDialog,
     QTextEdit, QVBoxLayout, QWidget, QProgressBar, QLabel,
     QLineEdit, QDockWidget, QTableView
 )
 from PySide6.QtCore import (QTimer, QAbstractTableModel, Qt, QModelIndex)
-from PySide6.QtGui import QAction
+from PySide6.QtGui import QAction, QTextCursor
 
-# ===================================================================
-# FUNGSI WORKER DAN FUNGSI BANTUAN EKSTRAKSI
-# ===================================================================
-def get_cell_coordinates(row_boxes, column_boxes):
-    cells = []
-    for row_box in row_boxes:
-        row_cells = []
-        for col_box in column_boxes:
-            cell_box = [col_box[0], row_box[1], col_box[2], row_box[3]]
-            row_cells.append(cell_box)
-        cells.append(row_cells)
-    return cells
-
-def apply_ocr_to_cell(image, cell_coords):
-    cell_image = image.crop(cell_coords)
-    try:
-        # Optimasi OCR dengan bahasa Inggris dan Indonesia
-        text = pytesseract.image_to_string(cell_image, config='--psm 7 -l eng+ind').strip()
-    except Exception:
-        text = ""
-    return text
-
-def extraction_worker(queue, pdf_path, image_dir, output_csv, start_page, stop_signal):
-    try:
-        queue.put(("LOG", "Memuat model (Proses Worker Baru)..."))
-        # Gunakan GPU jika tersedia
-        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        detection_processor = AutoImageProcessor.from_pretrained("microsoft/table-transformer-detection")
-        detection_model = AutoModelForObjectDetection.from_pretrained("microsoft/table-transformer-detection").to(device)
-        structure_processor = AutoImageProcessor.from_pretrained("microsoft/table-transformer-structure-recognition")
-        structure_model = AutoModelForObjectDetection.from_pretrained("microsoft/table-transformer-structure-recognition").to(device)
-        queue.put(("LOG", f"Model berhasil dimuat di worker (Device: {device})."))
-        
-        image_files = sorted([f for f in os.listdir(image_dir) if f.lower().endswith((".png", ".jpg", ".jpeg"))])
-        total_pages = len(image_files)
-
-        for i in range(start_page - 1, total_pages):
-            if stop_signal.is_set():
-                queue.put(("LOG", "Sinyal berhenti diterima. Menutup worker."))
-                break
-            page_num = i + 1
-            image_path = os.path.join(image_dir, image_files[i])
-            queue.put(("LOG", f"\n--- Memproses Halaman {page_num}/{total_pages} ---"))
-            try:
-                image = Image.open(image_path).convert("RGB")
-            except Exception as e:
-                queue.put(("LOG", f"!!! Gagal membuka gambar {image_files[i]}: {e}"))
-                continue
-
-            inputs = detection_processor(images=image, return_tensors="pt").to(device)
-            outputs = detection_model(**inputs)
-            target_sizes = torch.tensor([image.size[::-1]])
-            detection_results = detection_processor.post_process_object_detection(outputs, target_sizes=target_sizes, threshold=0.85)[0]
-            table_boxes = [box.tolist() for label, box in zip(detection_results["labels"], detection_results["boxes"]) if detection_model.config.id2label[label.item()] == 'table']
-
-            if not table_boxes:
-                queue.put(("LOG", f"Tidak ada tabel di halaman {page_num}."))
-            else:
-                queue.put(("LOG", f"Ditemukan {len(table_boxes)} tabel."))
-                for table_idx, table_box in enumerate(table_boxes):
-                    table_image = image.crop(table_box)
-                    inputs = structure_processor(images=table_image, return_tensors="pt").to(device)
-                    outputs = structure_model(**inputs)
-                    target_sizes = torch.tensor([table_image.size[::-1]])
-                    structure_results = structure_processor.post_process_object_detection(outputs, target_sizes=target_sizes, threshold=0.7)[0]
-
-                    row_boxes = [box.tolist() for label, box in zip(structure_results["labels"], structure_results["boxes"]) if structure_model.config.id2label[label.item()] == 'table row']
-                    column_boxes = [box.tolist() for label, box in zip(structure_results["labels"], structure_results["boxes"]) if structure_model.config.id2label[label.item()] == 'table column']
-                    
-                    row_boxes.sort(key=lambda x: x[1])
-                    column_boxes.sort(key=lambda x: x[0])
-
-                    if not row_boxes or not column_boxes:
-                        continue
-                    cell_coordinates = get_cell_coordinates(row_boxes, column_boxes)
-                    table_data = []
-                    for row in cell_coordinates:
-                        row_text = [apply_ocr_to_cell(table_image, cell) for cell in row]
-                        table_data.append(row_text)
-                        
-                    if table_data:
-                        df = pd.DataFrame(table_data)
-                        df['page_number'] = page_num
-                        df['table_on_page'] = table_idx + 1
-                        id_cols = ['page_number', 'table_on_page']
-                        data_cols = [col for col in df.columns if col not in id_cols]
-                        df = df[id_cols + data_cols]
-                        
-                        header = not os.path.exists(output_csv)
-                        df.to_csv(output_csv, mode='a', header=header, index=False)
-                        queue.put(("LOG", f"  Tabel #{table_idx + 1} disimpan. [{len(table_data)} baris]"))
-
-            queue.put(("PROGRESS", page_num))
-        queue.put(("DONE", "Proses worker selesai."))
-    except Exception as e:
-        queue.put(("ERROR", f"Error di worker: {e}"))
+from ekstraktor.api import find_pending_pages
+from ekstraktor.batch import batch_worker, collect_pdf_paths
+from ekstraktor.memory import process_rss
+from ekstraktor.pages import IMAGE_CACHE_DIR, PdfPageSource
+from ekstraktor.pipeline import extraction_worker
 
 # ===================================================================
-# KELAS MODEL PANDAS UNTUK QTABLEVIEW
+# MODEL TABEL CSV VIRTUAL UNTUK QTABLEVIEW
 # ===================================================================
-class PandasModel(QAbstractTableModel):
-    def __init__(self, data=pd.DataFrame()):
+class CsvTableModel(QAbstractTableModel):
+    """Model tabel yang membaca CSV output secara berjendela, bukan memuat seluruh isinya.
+
+    Yang disimpan di memori hanya offset byte awal setiap blok `BLOCK_ROWS` baris dan
+    sejumlah terbatas blok teks yang sudah diformat (LRU). Saat sebuah blok dibutuhkan,
+    blok tetangganya ikut dibaca sebagai prefetch. File yang bertambah diindeks secara
+    bertahap mulai dari offset terakhir, dan baris baru disisipkan dengan beginInsertRows.
+    """
+    BLOCK_ROWS = 256
+    CACHE_BLOCKS = 64
+    PREFETCH_BLOCKS = 1
+    # Batas byte yang diindeks per giliran event loop agar GUI tetap responsif
+    INDEX_CHUNK_BYTES = 8 * 1024 * 1024
+
+    def __init__(self):
         super().__init__()
-        self._data = data
+        self._reset_state(None)
+
+    def _reset_state(self, csv_path):
+        self._csv_path = csv_path
+        self._columns = []
+        self._block_offsets = array("q")
+        self._row_count = 0
+        # Offset akhir record lengkap terakhir yang sudah diindeks
+        self._indexed_end = 0
+        self._blocks = OrderedDict()
+        self._index_pending = False
 
     def rowCount(self, parent=QModelIndex()):
-        return self._data.shape[0]
+        return self._row_count
 
     def columnCount(self, parent=QModelIndex()):
-        return self._data.shape[1]
+        return len(self._columns)
 
     def data(self, index, role=Qt.DisplayRole):
         if index.isValid() and role == Qt.DisplayRole:
-            return str(self._data.iloc[index.row(), index.column()])
+            row = self._block(index.row() // self.BLOCK_ROWS)[index.row() % self.BLOCK_ROWS]
+            return row[index.column()] if index.column() < len(row) else ""
         return None
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role == Qt.DisplayRole and orientation == Qt.Horizontal:
-            return str(self._data.columns[section])
+            return self._columns[section]
         return None
-    
+
+    def _block(self, block_idx):
+        block = self._blocks.get(block_idx)
+        if block is not None:
+            self._blocks.move_to_end(block_idx)
+            return block
+        last_block = len(self._block_offsets) - 1
+        first = max(0, block_idx - self.PREFETCH_BLOCKS)
+        last = min(last_block, block_idx + self.PREFETCH_BLOCKS)
+        while first < block_idx and first in self._blocks:
+            first += 1
+        while last > block_idx and last in self._blocks:
+            last -= 1
+        self._read_blocks(first, last)
+        return self._blocks[block_idx]
+
+    def _read_blocks(self, first, last):
+        """Membaca blok `first`..`last` dalam satu kali baca file dan memasukkannya ke cache."""
+        start = self._block_offsets[first]
+        end = self._block_offsets[last + 1] if last + 1 < len(self._block_offsets) else self._indexed_end
+        with open(self._csv_path, "rb") as f:
+            f.seek(start)
+            chunk = f.read(end - start)
+        rows = [tuple(row) for row in csv.reader(io.StringIO(chunk.decode("utf-8", errors="replace")))]
+        for offset, block_idx in enumerate(range(first, last + 1)):
+            block = rows[offset * self.BLOCK_ROWS:(offset + 1) * self.BLOCK_ROWS]
+            # Blok yang terpotong (file berubah di luar dugaan) diisi baris kosong
+            block += [()] * (self._rows_in_block(block_idx) - len(block))
+            self._blocks[block_idx] = block
+            self._blocks.move_to_end(block_idx)
+        while len(self._blocks) > self.CACHE_BLOCKS:
+            self._blocks.popitem(last=False)
+
+    def _rows_in_block(self, block_idx):
+        return min(self.BLOCK_ROWS, self._row_count - block_idx * self.BLOCK_ROWS)
+
+    def _index_chunk(self, chunk, base_offset):
+        """Mencatat awal record dalam `chunk`; mengembalikan (byte terpakai, jumlah baris baru).
+
+        Newline di dalam field ber-kutip tidak dihitung sebagai akhir record (paritas tanda kutip).
+        """
+        pos = consumed = new_rows = 0
+        in_quotes = False
+        while True:
+            newline = chunk.find(b"\n", pos)
+            if newline < 0:
+                break
+            if chunk.count(b'"', pos, newline) % 2:
+                in_quotes = not in_quotes
+            if not in_quotes:
+                if not self._columns:
+                    header = chunk[consumed:newline + 1].decode("utf-8", errors="replace")
+                    self._columns = next(csv.reader([header.rstrip("\r\n")]), [])
+                else:
+                    if (self._row_count + new_rows) % self.BLOCK_ROWS == 0:
+                        self._block_offsets.append(base_offset + consumed)
+                    new_rows += 1
+                consumed = newline + 1
+            pos = newline + 1
+        return consumed, new_rows
+
+    def _index_more(self):
+        """Mengindeks byte baru hingga INDEX_CHUNK_BYTES; mengembalikan True jika masih ada sisa."""
+        size = os.path.getsize(self._csv_path)
+        with open(self._csv_path, "rb") as f:
+            f.seek(self._indexed_end)
+            chunk = f.read(self.INDEX_CHUNK_BYTES)
+        had_columns = bool(self._columns)
+        consumed, new_rows = self._index_chunk(chunk, self._indexed_end)
+        if not had_columns and self._columns:
+            self.beginResetModel()
+            self.endResetModel()
+        self._indexed_end += consumed
+        if new_rows:
+            first = self._row_count
+            # Blok terakhir yang sebelumnya belum penuh kini bertambah barisnya
+            self._blocks.pop(first // self.BLOCK_ROWS, None)
+            self.beginInsertRows(QModelIndex(), first, first + new_rows - 1)
+            self._row_count += new_rows
+            self.endInsertRows()
+        if consumed == 0 and len(chunk) == self.INDEX_CHUNK_BYTES:
+            # Chunk penuh tanpa satu pun record lengkap: record lebih besar dari chunk
+            self.INDEX_CHUNK_BYTES *= 2
+            return True
+        return consumed > 0 and self._indexed_end < size
+
+    def _continue_indexing(self):
+        self._index_pending = False
+        try:
+            if self._csv_path and os.path.exists(self._csv_path) and self._index_more():
+                self._schedule_indexing()
+        except Exception as e:
+            print(f"Error indexing CSV: {e}")
+
+    def _schedule_indexing(self):
+        if not self._index_pending:
+            self._index_pending = True
+            QTimer.singleShot(0, self._continue_indexing)
+
     def loadData(self, csv_path):
-        """Memuat ulang data dari file CSV dan memperbarui tampilan."""
+        """Memuat atau memperbarui tampilan CSV; hanya bagian file yang baru yang diindeks."""
         try:
-            if os.path.exists(csv_path):
-                self._data = pd.read_csv(csv_path, on_bad_lines='skip')
-            else:
-                self._data = pd.DataFrame()
-            self.layoutChanged.emit()
+            if not os.path.exists(csv_path):
+                self.beginResetModel()
+                self._reset_state(csv_path)
+                self.endResetModel()
+                return True
+            if csv_path != self._csv_path or os.path.getsize(csv_path) < self._indexed_end:
+                self.beginResetModel()
+                self._reset_state(csv_path)
+                self.endResetModel()
+            if self._index_more():
+                self._schedule_indexing()
             return True
         except Exception as e:
             print(f"Error loading CSV: {e}")
-            self._data = pd.DataFrame()
-            self.layoutChanged.emit()
+            self.beginResetModel()
+            self._reset_state(None)
+            self.endResetModel()
             return False
 
+# ===================================================================
+# LOG TERMINAL BERBUFFER
+# ===================================================================
+class TerminalLogSink:
+    """Menampung pesan log lalu menuliskannya sekaligus ke terminal dan file log.
+
+    Pesan ditambahkan di akhir dokumen lewat QTextCursor, tanpa toHtml()/setHtml() atas
+    seluruh isi terminal, dan file log dibuka sekali per flush, bukan sekali per pesan.
+    Jumlah baris di terminal dibatasi agar dokumen tidak tumbuh tanpa batas; file log
+    tetap lengkap.
+    """
+    CURSOR = "█"
+
+    def __init__(self, terminal, log_path="ekstraksi_log.txt", flush_interval_ms=100, max_blocks=5000):
+        self.terminal = terminal
+        self.log_path = log_path
+        self.pending = []
+        self.cursor_shown = False
+        self.terminal.document().setMaximumBlockCount(max_blocks)
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(flush_interval_ms)
+
+    def write(self, message):
+        self.pending.append((time.strftime('%Y-%m-%d %H:%M:%S'), str(message)))
+
+    def flush(self):
+        if not self.pending:
+            return
+        messages, self.pending = self.pending, []
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("".join(f"{stamp} - {message}\n" for stamp, message in messages))
+
+        cursor = QTextCursor(self.terminal.document())
+        cursor.movePosition(QTextCursor.End)
+        if self.cursor_shown:
+            # Hapus kursor hacker dari baris terakhir sebelum menambah pesan baru
+            cursor.deletePreviousChar()
+        if not self.terminal.document().isEmpty():
+            cursor.insertBlock()
+        cursor.insertText("\n".join(message for _, message in messages) + self.CURSOR)
+        self.cursor_shown = True
+        scrollbar = self.terminal.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
+
 # ===================================================================
 # APLIKASI GUI UTAMA
 # ===================================================================
@@ -165,14 +246,19 @@ class MainWindow(QMainWindow):
 
         # Inisialisasi variabel state
         self.pdf_path = ""
-        self.image_dir = "temp_pdf_images"
+        self.image_dir = IMAGE_CACHE_DIR
         self.output_csv = "hasil_ekstraksi.csv"
         self.worker_process = None
         self.queue = multiprocessing.Queue()
         self.stop_signal = multiprocessing.Event()
         self.total_pages = 0
-        self.MEMORY_THRESHOLD = 85.0
+        # Cadangan terakhir: worker mengatur memorinya sendiri, GUI hanya turun tangan
+        # jika RAM sistem hampir habis
+        self.MEMORY_THRESHOLD = 95.0
         self.is_refreshing = False
+        # Mode batch: daftar PDF dan folder output (None = mode satu dokumen)
+        self.batch_pdf_paths = None
+        self.batch_output_dir = None
 
         self._setup_ui()
         self._setup_timers()
@@ -192,6 +278,7 @@ class MainWindow(QMainWindow):
             }
         """)
         self.setCentralWidget(self.hacker_terminal)
+        self.log_sink = TerminalLogSink(self.hacker_terminal)
         
         # --- Panel Kontrol (Dockable) ---
         control_dock = QDockWidget("Panel Kontrol", self)
@@ -205,6 +292,10 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.btn_select_pdf)
         self.lbl_pdf_path = QLabel("File PDF belum dipilih.")
         layout.addWidget(self.lbl_pdf_path)
+
+        self.btn_select_batch = QPushButton("Mode Batch (Folder PDF)")
+        self.btn_select_batch.clicked.connect(self.select_batch_folder)
+        layout.addWidget(self.btn_select_batch)
         
         layout.addWidget(QLabel("Output CSV:"))
         self.txt_output_csv = QLineEdit(self.output_csv)
@@ -223,7 +314,7 @@ class MainWindow(QMainWindow):
         self.progress_bar = QProgressBar()
         layout.addWidget(self.progress_bar)
         
-        self.lbl_memory = QLabel("Penggunaan RAM: 0%")
+        self.lbl_memory = QLabel("RAM worker: -")
         layout.addWidget(self.lbl_memory)
         layout.addStretch()
         
@@ -235,8 +326,8 @@ class MainWindow(QMainWindow):
         table_dock.setAllowedAreas(Qt.AllDockWidgetAreas)
         
         self.table_view = QTableView()
-        self.pandas_model = PandasModel()
-        self.table_view.setModel(self.pandas_model)
+        self.table_model = CsvTableModel()
+        self.table_view.setModel(self.table_model)
         
         table_dock.setWidget(self.table_view)
         self.addDockWidget(Qt.BottomDockWidgetArea, table_dock)
@@ -255,19 +346,12 @@ class MainWindow(QMainWindow):
         self.memory_timer.start(2000)
 
     def log(self, message):
-        """Fungsi log dengan efek kursor hacker dan logging ke file."""
-        current_html = self.hacker_terminal.toHtml()
-        if "cursor" in current_html:
-            current_html = current_html.replace('<span id="cursor">█</span>', '')
-            self.hacker_terminal.setHtml(current_html)
-            
-        self.hacker_terminal.append(message)
-        self.hacker_terminal.insertHtml('<span id="cursor">█</span>')
-        self.hacker_terminal.verticalScrollBar().setValue(self.hacker_terminal.verticalScrollBar().maximum())
-        
-        # Simpan ke file log
-        with open("ekstraksi_log.txt", "a", encoding="utf-8") as f:
-            f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {message}\n")
+        """Fungsi log dengan efek kursor hacker dan logging ke file (ditulis berkala oleh log_sink)."""
+        self.log_sink.write(message)
+
+    def closeEvent(self, event):
+        self.log_sink.flush()
+        super().closeEvent(event)
 
     def select_pdf(self):
         file_name, _ = QFileDialog.getOpenFileName(self, "Pilih PDF", "", "PDF Files (*.pdf)")
@@ -277,83 +361,85 @@ class MainWindow(QMainWindow):
             self.btn_start.setEnabled(True)
             self.output_csv = Path(file_name).stem + "_hasil.csv"
             self.txt_output_csv.setText(self.output_csv)
-            self.pandas_model.loadData(self.output_csv)
+            self.table_model.loadData(self.output_csv)
+
+    def select_batch_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Pilih Folder PDF")
+        if not folder:
+            return
+        pdf_paths = collect_pdf_paths([folder])
+        if not pdf_paths:
+            self.log(f"!!! Tidak ada file PDF di folder: {folder}")
+            return
+        self.batch_pdf_paths = pdf_paths
+        self.batch_output_dir = os.path.join(folder, "hasil_ekstraksi")
+        self.lbl_pdf_path.setText(f"Batch: {len(pdf_paths)} PDF")
+        self.log(f">>> Mode batch: {len(pdf_paths)} PDF, output di '{self.batch_output_dir}'.")
+        self.btn_start.setEnabled(False)
+        self.btn_select_pdf.setEnabled(False)
+        self.btn_select_batch.setEnabled(False)
+        self.btn_stop.setEnabled(True)
+        self.start_batch_worker()
+
+    def start_batch_worker(self):
+        if self.worker_process and self.worker_process.is_alive():
+            self.log("!!! Worker sebelumnya masih berjalan, harap tunggu.")
+            return
+        self.log(">>> Memulai Batch Worker...")
+        self.stop_signal.clear()
+        self.progress_bar.setValue(0)
+        self.worker_process = multiprocessing.Process(
+            target=batch_worker,
+            args=(self.queue, self.batch_pdf_paths, self.batch_output_dir, self.stop_signal)
+        )
+        self.worker_process.start()
+        self.is_refreshing = False
 
     def prepare_environment(self):
         self.output_csv = self.txt_output_csv.text()
         if not self.output_csv.endswith(".csv"):
             self.log("!!! Nama file output harus berekstensi .csv!")
-            return False, 0
+            return False, []
         
-        if not os.path.exists(self.image_dir):
-            os.makedirs(self.image_dir)
-        
-        existing_images = sorted([f for f in os.listdir(self.image_dir) if f.lower().endswith(".png")])
-        
-        if not existing_images:
-            self.log(f">>> Mengonversi PDF ke cache gambar di: '{self.image_dir}'...")
-            QApplication.processEvents()
-            try:
-                poppler_path = None
-                possible_poppler_paths = [
-                    r"D:\Release-24.08.0-0\poppler-24.08.0\Library\bin",
-                    r"C:\Program Files\poppler\bin",
-                    "/usr/bin",
-                    "/usr/local/bin",
-                ]
-                for path in possible_poppler_paths:
-                    if os.path.exists(path):
-                        poppler_path = path
-                        break
-                
-                images = convert_from_path(
-                    self.pdf_path,
-                    output_folder=self.image_dir,
-                    fmt='png',
-                    output_file='page_',
-                    thread_count=4,
-                    poppler_path=poppler_path
-                )
-                self.log(f">>> Konversi Selesai: {len(images)} halaman.")
-            except Exception as e:
-                self.log(f"!!! ERROR konversi PDF: {e}")
-                self.log(">>> Pastikan Poppler terinstal. Unduh dari: https://poppler.freedesktop.org/")
-                self.log(">>> Atau, tentukan path Poppler di kode atau melalui variabel lingkungan.")
-                return False, 0
-            else:
-                existing_images = sorted([f for f in os.listdir(self.image_dir) if f.lower().endswith((".png", ".jpg"))])
-                self.log(f">>> Menggunakan {len(existing_images)} gambar dari cache.")
-        
-        self.total_pages = len(existing_images)
+        try:
+            self.total_pages = PdfPageSource(self.pdf_path).page_count()
+        except Exception as e:
+            self.log(f"!!! ERROR membaca info PDF: {e}")
+            self.log(">>> Pastikan Poppler terinstal. Unduh dari: https://poppler.freedesktop.org/")
+            self.log(">>> Atau, tentukan path Poppler di POPPLER_PATHS.")
+            return False, []
+        self.log(f">>> PDF berisi {self.total_pages} halaman. Halaman dirasterisasi bertahap oleh worker.")
+
         self.progress_bar.setMaximum(self.total_pages)
-        start_page = 1
-        if os.path.exists(self.output_csv):
-            try:
-                df_existing = pd.read_csv(self.output_csv, on_bad_lines='skip')
-                if not df_existing.empty and 'page_number' in df_existing.columns:
-                    last_processed_page = df_existing['page_number'].max()
-                    if last_processed_page >= self.total_pages:
-                        self.log(">>> CSV sudah mencakup semua halaman. Proses dianggap selesai.")
-                        return False, 0
-                    start_page = int(last_processed_page) + 1
-                    self.log(f">>> CSV ditemukan. Melanjutkan dari halaman {start_page}.")
-            except Exception as e:
-                self.log(f"!!! Warning saat baca CSV: {e}. Memulai dari awal.")
+        try:
+            pages = find_pending_pages(self.output_csv, self.total_pages)
+        except Exception as e:
+            self.log(f"!!! ERROR membaca manifest/CSV output: {e}")
+            return False, []
+        # load_progress bisa memotong CSV (sisa commit terputus, migrasi CSV lama); indeks
+        # tampilan harus menyesuaikan sebelum worker menambahkan baris baru
+        self.table_model.loadData(self.output_csv)
+        if not pages:
+            self.log(">>> Semua halaman sudah tercatat selesai. Proses dianggap selesai.")
+            return False, []
+        if len(pages) < self.total_pages:
+            self.log(f">>> Output ditemukan. Melanjutkan {len(pages)} halaman tertunda mulai halaman {pages[0]}.")
+        self.progress_bar.setValue(self.total_pages - len(pages))
         
-        return True, start_page
+        return True, pages
 
     def start_extraction(self):
-        success, start_page = self.prepare_environment()
+        success, pages = self.prepare_environment()
         if not success:
             self.log(">>> Persiapan gagal atau sudah selesai. Proses dihentikan.")
             return
 
-        self.progress_bar.setValue(start_page - 1)
         self.btn_start.setEnabled(False)
         self.btn_select_pdf.setEnabled(False)
+        self.btn_select_batch.setEnabled(False)
         self.btn_stop.setEnabled(True)
-        self.log(f"\n>>> [PROSES DIMULAI] - Halaman {start_page} dari {self.total_pages}...")
-        self.start_worker(start_page)
+        self.log(f"\n>>> [PROSES DIMULAI] - Halaman {pages[0]} dari {self.total_pages}...")
+        self.start_worker(pages)
 
     def stop_extraction(self):
         if self.worker_process and self.worker_process.is_alive():
@@ -361,15 +447,16 @@ class MainWindow(QMainWindow):
             self.stop_signal.set()
             self.btn_stop.setEnabled(False)
 
-    def start_worker(self, start_page):
+    def start_worker(self, pages):
         if self.worker_process and self.worker_process.is_alive():
             self.log("!!! Worker sebelumnya masih berjalan, harap tunggu.")
             return
-        self.log(f">>> Memulai Worker Process dari Halaman {start_page}...")
+        self.log(f">>> Memulai Worker Process dari Halaman {pages[0]} ({len(pages)} halaman tertunda)...")
         self.stop_signal.clear()
         self.worker_process = multiprocessing.Process(
             target=extraction_worker,
-            args=(self.queue, self.pdf_path, self.image_dir, self.output_csv, start_page, self.stop_signal)
+            args=(self.queue, self.pdf_path, self.image_dir, self.output_csv, pages, self.stop_signal),
+            kwargs={"allow_restart": True}
         )
         self.worker_process.start()
         self.is_refreshing = False
@@ -381,10 +468,19 @@ class MainWindow(QMainWindow):
                 msg_type, message = self.queue.get(block=False)
                 if msg_type == "LOG":
                     self.log(message)
+                elif msg_type == "TOTAL":
+                    self.progress_bar.setMaximum(message)
                 elif msg_type == "PROGRESS":
-                    self.progress_bar.setValue(message)
-                    self.pandas_model.loadData(self.output_csv)
-                    self.table_view.scrollToBottom()
+                    if self.batch_pdf_paths is None:
+                        # Mode satu dokumen mengirim nomor halaman; halaman tertunda bisa tidak bersambung
+                        self.progress_bar.setValue(self.progress_bar.value() + 1)
+                        self.table_model.loadData(self.output_csv)
+                        self.table_view.scrollToBottom()
+                    else:
+                        self.progress_bar.setValue(message)
+                elif msg_type == "RESTART":
+                    self.log(f"\n!!! [MEMORI WORKER] {message} Worker dimulai ulang di batas halaman...")
+                    self.is_refreshing = True
                 elif msg_type == "DONE":
                     self.log(f">>> Worker Selesai: {message}")
                     self.process_finished()
@@ -402,33 +498,44 @@ class MainWindow(QMainWindow):
                 self.worker_process.terminate()
             self.worker_process = None
 
-        self.pandas_model.loadData(self.output_csv)
+        if self.batch_pdf_paths is None:
+            self.table_model.loadData(self.output_csv)
 
         if self.is_refreshing:
-            self.log(">>> Refresh memori selesai. Melanjutkan dalam 5 detik...")
-            QTimer.singleShot(5000, self.resume_after_refresh)
+            self.log(">>> Refresh memori selesai. Melanjutkan dalam 1 detik...")
+            QTimer.singleShot(1000, self.resume_after_refresh)
         else:
             self.log("\n--- [PROSES SELESAI] ---")
             self.reset_ui()
     
     def resume_after_refresh(self):
-        success, start_page = self.prepare_environment()
+        if self.batch_pdf_paths is not None:
+            self.start_batch_worker()
+            return
+        success, pages = self.prepare_environment()
         if success:
-            self.start_worker(start_page)
+            self.start_worker(pages)
         else:
             self.log("!!! Gagal melanjutkan setelah refresh memori.")
             self.reset_ui()
 
     def reset_ui(self):
-        self.btn_start.setEnabled(True)
+        self.btn_start.setEnabled(bool(self.pdf_path))
         self.btn_select_pdf.setEnabled(True)
+        self.btn_select_batch.setEnabled(True)
         self.btn_stop.setEnabled(False)
         self.is_refreshing = False
+        self.batch_pdf_paths = None
 
     def check_memory_usage(self):
-        memory_info = psutil.virtual_memory()
-        usage_percent = memory_info.percent
-        self.lbl_memory.setText(f"Penggunaan RAM: {usage_percent:.1f}%")
+        usage_percent = psutil.virtual_memory().percent
+        worker_text = "-"
+        if self.worker_process and self.worker_process.is_alive():
+            try:
+                worker_text = f"{process_rss(self.worker_process.pid) / 1024 / 1024:.0f} MB"
+            except psutil.Error:
+                pass
+        self.lbl_memory.setText(f"RAM worker: {worker_text} | Sistem: {usage_percent:.1f}%")
         if usage_percent > self.MEMORY_THRESHOLD and self.worker_process and self.worker_process.is_alive() and not self.is_refreshing:
             self.log(f"\n!!! [MEMORI TINGGI] RAM mencapai {usage_percent}%, memicu refresh...")
             self.is_refreshing = True
@@ -442,4 +549,4 @@ if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
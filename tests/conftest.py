@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tes dijalankan dari checkout tanpa instalasi paket
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("pytesseract")
+
+from ekstraktor.ocr import OCR_MIN_CONFIDENCE, assign_words_to_cells, get_cell_coordinates
+
+CELLS = get_cell_coordinates([[0, 0, 200, 20], [0, 20, 200, 40]], [[0, 0, 100, 40], [100, 0, 200, 40]])
+
+def word(text, box, conf=95.0):
+    return {'text': text, 'conf': conf, 'box': box}
+
+def test_words_are_joined_per_cell_in_reading_order():
+    words = [
+        word("dunia", [50, 2, 90, 18]),
+        word("halo", [5, 2, 45, 18]),
+        word("bawah", [110, 22, 150, 30]),
+        word("atas", [110, 30, 150, 38]),
+    ]
+    table_data, ambiguous = assign_words_to_cells(words, CELLS)
+    assert table_data == [["halo dunia", ""], ["", "bawah atas"]]
+    assert ambiguous == set()
+
+def test_word_straddling_border_marks_cell_ambiguous():
+    # 55% di kolom kiri: masuk ke sel dengan tumpang tindih terbesar, tetapi ambigu
+    table_data, ambiguous = assign_words_to_cells([word("lintas", [45, 2, 145, 18])], CELLS)
+    assert table_data[0][0] == "lintas"
+    assert ambiguous == {(0, 0)}
+
+def test_low_confidence_marks_cell_ambiguous():
+    words = [word("buram", [110, 2, 150, 18], conf=OCR_MIN_CONFIDENCE - 1)]
+    table_data, ambiguous = assign_words_to_cells(words, CELLS)
+    assert table_data[0][1] == "buram"
+    assert ambiguous == {(0, 1)}
+
+def test_words_outside_table_are_ignored():
+    table_data, ambiguous = assign_words_to_cells([word("luar", [10, 50, 40, 60])], CELLS)
+    assert table_data == [["", ""], ["", ""]]
+    assert ambiguous == set()
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("PySide6")
+gui = pytest.importorskip("inputdatasungai")
+
+HEADER = b"page_number,table_on_page,0\n"
+
+def make_model(block_rows=2):
+    model = gui.CsvTableModel()
+    model.BLOCK_ROWS = block_rows
+    return model
+
+def test_header_rows_and_incomplete_tail():
+    model = make_model()
+    chunk = HEADER + b"1,1,a\n1,1,b\n2,1,c\n2,1,d"
+    consumed, new_rows = model._index_chunk(chunk, 0)
+    assert model._columns == ["page_number", "table_on_page", "0"]
+    assert new_rows == 3
+    # Record terakhir belum diakhiri newline, jadi belum dianggap lengkap
+    assert chunk[consumed:] == b"2,1,d"
+
+def test_newline_inside_quotes_is_not_a_record_end():
+    model = make_model()
+    chunk = HEADER + b'1,1,"baris satu\n9,1,bukan record"\n2,1,c\n'
+    consumed, new_rows = model._index_chunk(chunk, 0)
+    assert new_rows == 2
+    assert consumed == len(chunk)
+
+def test_block_offsets_across_chunks():
+    model = make_model()
+    first = HEADER + b"1,1,a\n1,1,b\n2,1,c\n"
+    consumed, new_rows = model._index_chunk(first, 0)
+    model._row_count += new_rows
+    second = b"2,1,d\n3,1,e\n"
+    consumed2, new_rows2 = model._index_chunk(second, consumed)
+    assert (new_rows, new_rows2) == (3, 2)
+    # Awal blok 2 baris: baris 0, 2, dan 4
+    assert list(model._block_offsets) == [len(HEADER), len(HEADER) + 12, consumed + 6]
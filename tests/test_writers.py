@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import os
+
+from ekstraktor.writers import ProgressManifest, TableWriter, load_progress
+
+def page_tables(page_num, rows=2):
+    return [(0, [[f"p{page_num}r{r}", "x"] for r in range(rows)])]
+
+def write_pages(output, pages, formats=("csv",)):
+    writer = TableWriter(output, formats=formats)
+    for page_num in pages:
+        writer.add_page(page_num, page_tables(page_num))
+    writer.close()
+    return writer
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+def write_legacy_csv(path, rows):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows([["page_number", "table_on_page", "0", "1"]] + rows)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.write(buffer.getvalue())
+
+def test_commit_then_resume(tmp_path):
+    output = str(tmp_path / "hasil.csv")
+    write_pages(output, [1, 2, 3])
+
+    manifest = load_progress(output, 5)
+    assert manifest.pending_pages(5) == [4, 5]
+
+    writer = TableWriter(output, formats=("csv",), manifest=manifest)
+    writer.add_page(4, page_tables(4))
+    writer.close()
+    rows = read_rows(output)
+    assert rows[0] == ["page_number", "table_on_page", "0", "1"]
+    assert [row[0] for row in rows[1:]] == ["1", "1", "2", "2", "3", "3", "4", "4"]
+    assert load_progress(output, 5).pending_pages(5) == [5]
+
+def test_torn_tail_is_truncated(tmp_path):
+    output = str(tmp_path / "hasil.csv")
+    write_pages(output, [1, 2])
+    committed = os.path.getsize(output)
+    # Commit halaman 3 terputus di tengah penulisan
+    with open(output, "ab") as f:
+        f.write(b"3,1,p3r0,x\n3,1,p3")
+
+    manifest = load_progress(output, 3)
+    assert manifest.pending_pages(3) == [3]
+    assert os.path.getsize(output) == committed
+    assert [row[0] for row in read_rows(output)[1:]] == ["1", "1", "2", "2"]
+
+def test_csv_shorter_than_manifest_falls_back_to_scan(tmp_path):
+    output = str(tmp_path / "hasil.csv")
+    write_pages(output, [1, 2, 3])
+    page2_end = ProgressManifest(output).outputs["csv"]["pages"]["2"][1]
+    with open(output, "r+b") as f:
+        f.truncate(page2_end - 3)
+
+    manifest = load_progress(output, 3)
+    # Halaman terakhir di CSV (2) mungkin tidak lengkap, jadi ikut diulang
+    assert manifest.pending_pages(3) == [2, 3]
+    assert [row[0] for row in read_rows(output)[1:]] == ["1", "1"]
+
+def test_legacy_csv_without_manifest_is_migrated(tmp_path):
+    output = str(tmp_path / "hasil.csv")
+    write_legacy_csv(output, [["1", "1", "a", "b"], ["1", "1", "c", "d"], ["2", "1", "e", "f"]])
+
+    manifest = load_progress(output, 4)
+    assert manifest.pending_pages(4) == [2, 3, 4]
+    assert [row[0] for row in read_rows(output)[1:]] == ["1", "1"]
+    with open(output + ".progress.json", encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["completed_pages"] == [1]
+    assert state["outputs"]["csv"]["bytes"] == os.path.getsize(output)
+
+def test_legacy_scan_ignores_newlines_inside_quotes(tmp_path):
+    output = str(tmp_path / "hasil.csv")
+    # Baris kedua sel ini terlihat seperti record halaman 9 jika kutip diabaikan
+    write_legacy_csv(output, [["1", "1", "baris satu\n9,1,bukan record", "b"], ["2", "1", "c", "d"], ["3", "1", "e", "f"]])
+
+    manifest = load_progress(output, 3)
+    assert manifest.pending_pages(3) == [3]
+    rows = read_rows(output)
+    assert rows[1][2] == "baris satu\n9,1,bukan record"
+    assert [row[0] for row in rows[1:]] == ["1", "2"]
+
+def test_new_format_on_resume_restarts_all_pages(tmp_path):
+    output = str(tmp_path / "hasil.csv")
+    write_pages(output, [1, 2])
+    parts = tmp_path / "hasil.parquet"
+    parts.mkdir()
+    (parts / "part-000000.parquet").write_bytes(b"bukan dari run ini")
+
+    manifest = load_progress(output, 2, ("csv", "parquet"))
+    assert manifest.pending_pages(2) == [1, 2]
+    assert os.path.getsize(output) == 0
+    assert os.listdir(parts) == []